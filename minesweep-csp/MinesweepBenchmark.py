@@ -1,17 +1,269 @@
+import argparse
+import contextlib
+import csv
+import json
+import math
+import multiprocessing
+import os
+import sys
 import time
 import random
-import numpy as np
-import matplotlib.pyplot as plt
 from collections import defaultdict
-import pandas as pd
-from backend import MinesweeperBackend
-from tqdm import tqdm
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from backend import MinesweeperBackend, SolverFactory
+from corpus import board_seed, open_corpus
+from replay import seed_step
+
+# numpy, pandas, matplotlib and tqdm are imported where they are used so that
+# headless runs and worker processes do not pay for them at start-up.
+
+
+class _NoProgress:
+    """Stand-in for tqdm when it is not installed or not wanted."""
+
+    def __init__(self, total=None, desc=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def update(self, n=1):
+        pass
+
+
+def _progress(total, desc, enabled=True):
+    """Return a tqdm progress bar, or a silent one if tqdm is unavailable."""
+    if enabled:
+        try:
+            from tqdm import tqdm
+
+            return tqdm(total=total, desc=desc)
+        except ImportError:
+            pass
+    return _NoProgress(total=total, desc=desc)
+
+
+def _corpus_index(boards, width, height, num_mines, index):
+    """
+    Wrap ``index`` around the boards of a corpus group.
+
+    Raises:
+        ValueError: If the corpus has no boards of this configuration
+    """
+    count = boards.count(width, height, num_mines)
+    if not count:
+        raise ValueError(
+            f"Corpus has no {width}x{height} boards with {num_mines} mines"
+        )
+    return index % count
+
+
+def _run_trial(width, height, density, solver_type, trial, corpus=None):
+    """
+    Play one seeded game and return its result row.
+
+    With ``corpus``, the board is board number ``trial`` of the pre-generated
+    corpus at that path, so every solver plays exactly the same instances.
+    """
+    total_cells = width * height
+    num_mines = int(total_cells * density / 100)
+    random.seed(width * height * density * trial)
+
+    # The backend prints on every move
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        # Create a new game
+        start_time = time.time()
+        if corpus is None:
+            game = MinesweeperBackend(width, height, num_mines, solver_type)
+        else:
+            boards = open_corpus(corpus)
+            index = _corpus_index(boards, width, height, num_mines, trial)
+            game = boards.board(width, height, num_mines, index, solver_type)
+
+        # Solve the game
+        solve_result = game.solve_game(max_iterations=10000)
+        end_time = time.time()
+
+    return {
+        "board_size": f"{width}x{height}",
+        "density": density,
+        "solver": solver_type,
+        "num_mines": num_mines,
+        "success": solve_result["success"],
+        "iterations": solve_result["iterations"],
+        "explosions": solve_result["explosions"],
+        "time": end_time - start_time,
+    }
+
+
+def _geometric_sizes(min_side, max_side, area_factor):
+    """Square board sizes whose area grows by ``area_factor`` at each step."""
+    sizes = []
+    side = float(min_side)
+    while round(side) < max_side:
+        sizes.append((round(side), round(side)))
+        side *= math.sqrt(area_factor)
+    sizes.append((max_side, max_side))
+    return sizes
+
+
+def _fit_exponent(xs, ys):
+    """Least-squares slope of log(ys) against log(xs), or None if underdetermined."""
+    points = [(math.log(x), math.log(y)) for x, y in zip(xs, ys) if x > 0 and y > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(p[0] for p in points) / len(points)
+    mean_y = sum(p[1] for p in points) / len(points)
+    var_x = sum((p[0] - mean_x) ** 2 for p in points)
+    if var_x == 0:
+        return None
+    cov = sum((p[0] - mean_x) * (p[1] - mean_y) for p in points)
+    return cov / var_x
+
+
+def _peak_rss():
+    """Peak resident set size of this process in bytes, or None if unknown."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _scaling_worker(width, height, num_mines, solver_type, seed, heartbeat, conn):
+    """
+    Solve one board in a child process and send back time and peak memory.
+
+    ``heartbeat`` is refreshed after every solver step so the parent can tell
+    a slow solve from a single step that never returns. Memory is the growth
+    of the peak RSS over the solve, read after timing: tracing allocations
+    would slow the solve down several times and skew the time exponents.
+    """
+    random.seed(seed)
+    start_rss = _peak_rss()
+    start_time = time.perf_counter()
+    heartbeat.value = time.monotonic()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        game = MinesweeperBackend(width, height, num_mines, solver_type)
+        heartbeat.value = time.monotonic()
+
+        iterations = 0
+        max_iterations = width * height
+        while not game.game_over and iterations < max_iterations:
+            if game.solve_next_move() is None:
+                break
+            game.apply_solver_move()
+            iterations += 1
+            heartbeat.value = time.monotonic()
+
+    elapsed = time.perf_counter() - start_time
+    peak = None if start_rss is None else _peak_rss() - start_rss
+    conn.send(
+        {
+            "time": elapsed,
+            "peak_memory": peak,
+            "iterations": iterations,
+            "explosions": game.nb_explosions,
+            "success": game.won,
+        }
+    )
+    conn.close()
+
+
+def _tournament_board(width, height, num_mines, density, index, solver_types, corpus):
+    """
+    Play one board with every solver and return a result row per solver.
+
+    The board is built once (or loaded from ``corpus``) and each solver plays
+    a copy-on-write clone of it. ``random`` is reseeded before every move as
+    in ``replay.record``, so each game can be recorded and replayed exactly,
+    and the result of a solver does not depend on which process played it.
+    A game without any move has no ``time_per_move``.
+    """
+    if corpus is None:
+        seed = board_seed(0, width, height, num_mines, index)
+        base = MinesweeperBackend(width, height, num_mines, seed=seed)
+    else:
+        boards = open_corpus(corpus)
+        base = boards.board(
+            width,
+            height,
+            num_mines,
+            _corpus_index(boards, width, height, num_mines, index),
+        )
+
+    rows = []
+    for solver_type in solver_types:
+        game = base.clone(solver_type)
+        moves = 0
+        solver_time = 0.0
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            while not game.game_over and moves < width * height:
+                seed_step(base.seed, moves)
+                start = time.perf_counter()
+                move = game.solve_next_move()
+                solver_time += time.perf_counter() - start
+                if move is None:
+                    break
+                game.apply_solver_move()
+                moves += 1
+        rows.append(
+            {
+                "board_size": f"{width}x{height}",
+                "density": density,
+                "board": index,
+                "seed": base.seed,
+                "solver": solver_type,
+                "success": game.won,
+                "explosions": game.nb_explosions,
+                "moves": moves,
+                "solver_time": solver_time,
+                "time_per_move": solver_time / moves if moves else None,
+            }
+        )
+    return rows
+
+
+def _binomial_test(k, n):
+    """Exact two-sided p-value of ``k`` successes in ``n`` fair coin flips."""
+    if n == 0:
+        return 1.0
+    tail = sum(math.comb(n, i) for i in range(min(k, n - k) + 1))
+    return min(1.0, 2 * tail / 2**n)
+
+
+def _paired_test(values_a, values_b):
+    """
+    Sign test on paired values, ties dropped.
+
+    Returns:
+        tuple: ``(a_lower, b_lower, p_value)``
+    """
+    a_lower = sum(a < b for a, b in zip(values_a, values_b))
+    b_lower = sum(b < a for a, b in zip(values_a, values_b))
+    return a_lower, b_lower, _binomial_test(a_lower, a_lower + b_lower)
 
 
 class MinesweeperBenchmark:
     """Benchmark class for evaluating Minesweeper solvers."""
 
-    def __init__(self, board_sizes=None, mine_densities=None, num_trials=50):
+    def __init__(
+        self,
+        board_sizes=None,
+        mine_densities=None,
+        num_trials=50,
+        solver_types=None,
+        workers=1,
+        progress=True,
+        corpus=None,
+    ):
         self.board_sizes = board_sizes or [
             (9, 9),
             (16, 16),
@@ -24,62 +276,425 @@ class MinesweeperBenchmark:
             25,
         ]
         self.num_trials = num_trials
-        self.solver_types = ["greedy", "astar", "astar_boost"]  # All three solvers
+        self.solver_types = solver_types or [
+            "greedy",
+            "astar",
+            "astar_boost",
+        ]  # All three solvers
+        self.workers = workers
+        self.progress = progress
+        self.corpus = corpus  # Path of a board corpus for the trials
         self.results = defaultdict(list)
+        self.scaling_results = []
+        self.tournament_results = []
+        self._df_results = None
+        self._df_scaling = None
 
     def run_benchmark(self):
-        """Run the benchmarking process across all configurations."""
+        """
+        Run the benchmarking process across all configurations.
+
+        Trials are spread over ``self.workers`` processes when it is greater
+        than one. Results are stored column-wise in ``self.results``; use
+        ``df_results`` to get them as a pandas DataFrame. Unlike earlier
+        versions, which returned that DataFrame, this returns the plain
+        columns so that benchmarks run without pandas.
+
+        Returns:
+            dict: Column name to list of values, one entry per trial
+        """
         self.results = defaultdict(list)
-
-        total_tests = (
-            len(self.board_sizes)
-            * len(self.mine_densities)
-            * len(self.solver_types)
-            * self.num_trials
-        )
-        with tqdm(total=total_tests, desc="Running benchmarks") as pbar:
-            for width, height in self.board_sizes:
-                for density in self.mine_densities:
-                    total_cells = width * height
-                    num_mines = int(total_cells * density / 100)
-
-                    for solver_type in self.solver_types:
-                        for trial in range(self.num_trials):
-                            random.seed(width * height * density * trial)
-
-                            # Create a new game
-                            start_time = time.time()
-                            game = MinesweeperBackend(
-                                width, height, num_mines, solver_type
+        self._df_results = None
+
+        tasks = [
+            (width, height, density, solver_type, trial, self.corpus)
+            for width, height in self.board_sizes
+            for density in self.mine_densities
+            for solver_type in self.solver_types
+            for trial in range(self.num_trials)
+        ]
+        rows = []
+        with _progress(len(tasks), "Running benchmarks", self.progress) as pbar:
+            if self.workers > 1:
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    futures = [executor.submit(_run_trial, *task) for task in tasks]
+                    # Collect in submission order so rows match a sequential run
+                    for future in futures:
+                        rows.append(future.result())
+                        pbar.update(1)
+            else:
+                for task in tasks:
+                    rows.append(_run_trial(*task))
+                    pbar.update(1)
+
+        for row in rows:
+            for key, value in row.items():
+                self.results[key].append(value)
+        return self.results
+
+    @property
+    def df_results(self):
+        """Benchmark results as a pandas DataFrame, built once per run."""
+        if self._df_results is None:
+            import pandas as pd
+
+            self._df_results = pd.DataFrame(self.results)
+        return self._df_results
+
+    @property
+    def df_scaling(self):
+        """Scaling results as a pandas DataFrame, built once per run."""
+        if self._df_scaling is None:
+            import pandas as pd
+
+            self._df_scaling = pd.DataFrame(self.scaling_results)
+        return self._df_scaling
+
+    def summary(self):
+        """
+        Average success rate, explosions and time per configuration.
+
+        Returns:
+            list: One dict per (board size, density, solver)
+        """
+        groups = defaultdict(list)
+        for i in range(len(self.results["solver"])):
+            key = (
+                self.results["board_size"][i],
+                self.results["density"][i],
+                self.results["solver"][i],
+            )
+            groups[key].append(i)
+
+        rows = []
+        for (board_size, density, solver), indices in groups.items():
+            n = len(indices)
+            rows.append(
+                {
+                    "board_size": board_size,
+                    "density": density,
+                    "solver": solver,
+                    "trials": n,
+                    "success_rate": sum(self.results["success"][i] for i in indices)
+                    / n,
+                    "avg_explosions": sum(
+                        self.results["explosions"][i] for i in indices
+                    )
+                    / n,
+                    "avg_time": sum(self.results["time"][i] for i in indices) / n,
+                }
+            )
+        return rows
+
+    def export(self, output_dir="benchmarks", fmt="csv"):
+        """
+        Write raw results (and scaling results, if any) without pandas.
+
+        Args:
+            output_dir (str): Directory receiving the files
+            fmt (str): 'csv' or 'json'
+
+        Returns:
+            list: Paths of the written files
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        tables = {}
+        if self.results["solver"]:
+            keys = list(self.results.keys())
+            tables["results"] = [
+                dict(zip(keys, values))
+                for values in zip(*(self.results[k] for k in keys))
+            ]
+        if self.scaling_results:
+            tables["scaling"] = self.scaling_results
+        if self.tournament_results:
+            tables["tournament"] = self.tournament_results
+
+        paths = []
+        for name, rows in tables.items():
+            path = os.path.join(output_dir, f"{name}.{fmt}")
+            with open(path, "w", newline="") as f:
+                if fmt == "json":
+                    payload = {"rows": rows}
+                    if name == "scaling":
+                        payload["complexity"] = getattr(self, "complexity", {})
+                    json.dump(payload, f, indent=2)
+                else:
+                    fieldnames = []
+                    for row in rows:
+                        fieldnames.extend(k for k in row if k not in fieldnames)
+                    writer = csv.DictWriter(f, fieldnames=fieldnames)
+                    writer.writeheader()
+                    writer.writerows(rows)
+            paths.append(path)
+        return paths
+
+    def run_tournament(self, solver_types=None):
+        """
+        Play every solver on the same boards and compare them pairwise.
+
+        For each (board size, density), ``num_trials`` boards are built (or
+        loaded from the corpus) from fixed seeds. With several workers, every
+        (board, solver) game is a separate task and the solvers of a board
+        are submitted together, so they play it concurrently in different
+        processes, each on the same seeded board. A single worker builds
+        each board once and plays it with every solver in turn, on
+        copy-on-write clones.
+
+        Args:
+            solver_types (list): Solvers to compare, every type registered in
+                ``SolverFactory`` by default
+
+        Returns:
+            list: One result row per (board, solver)
+        """
+        solver_types = solver_types or SolverFactory.solver_types()
+        tasks = [
+            (
+                width,
+                height,
+                int(width * height * density / 100),
+                density,
+                index,
+                solver_types,
+                self.corpus,
+            )
+            for width, height in self.board_sizes
+            for density in self.mine_densities
+            for index in range(self.num_trials)
+        ]
+        rows = []
+        with _progress(len(tasks), "Tournament", self.progress) as pbar:
+            if self.workers > 1:
+                with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                    futures = [
+                        [
+                            executor.submit(
+                                _tournament_board, *task[:5], [solver], task[6]
                             )
+                            for solver in solver_types
+                        ]
+                        for task in tasks
+                    ]
+                    for board in futures:
+                        for future in board:
+                            rows.extend(future.result())
+                        pbar.update(1)
+            else:
+                for task in tasks:
+                    rows.extend(_tournament_board(*task))
+                    pbar.update(1)
+        self.tournament_results = rows
+        return rows
+
+    def tournament_summary(self):
+        """
+        Per-solver totals and paired comparisons of the tournament.
+
+        Wins are compared with an exact McNemar test (a binomial test on the
+        boards only one of the two solvers won); explosions and time per
+        move with a sign test over the boards. Games are paired by board, so
+        board difficulty cancels out. Boards where a solver made no move
+        are left out of the time comparison.
+
+        Returns:
+            tuple: ``(solvers, pairs)`` lists of dicts
+        """
+        games = defaultdict(dict)  # (board size, density, board) -> solver -> row
+        for row in self.tournament_results:
+            key = (row["board_size"], row["density"], row["board"])
+            games[key][row["solver"]] = row
+        solver_types = list(dict.fromkeys(r["solver"] for r in self.tournament_results))
+
+        solvers = []
+        for solver in solver_types:
+            played = [game[solver] for game in games.values()]
+            moves = sum(r["moves"] for r in played)
+            solvers.append(
+                {
+                    "solver": solver,
+                    "games": len(played),
+                    "win_rate": sum(r["success"] for r in played) / len(played),
+                    "avg_explosions": sum(r["explosions"] for r in played)
+                    / len(played),
+                    "ms_per_move": (
+                        sum(r["solver_time"] for r in played) / moves * 1000
+                        if moves
+                        else 0.0
+                    ),
+                }
+            )
 
-                            # Solve the game
-                            solve_result = game.solve_game(max_iterations=10000)
-                            end_time = time.time()
-
-                            # Record results
-                            self.results["board_size"].append(f"{width}x{height}")
-                            self.results["density"].append(density)
-                            self.results["solver"].append(solver_type)
-                            self.results["num_mines"].append(num_mines)
-                            self.results["success"].append(solve_result["success"])
-                            self.results["iterations"].append(
-                                solve_result["iterations"]
-                            )
-                            self.results["explosions"].append(
-                                solve_result["explosions"]
+        pairs = []
+        for a, b in combinations(solver_types, 2):
+            rows_a = [game[a] for game in games.values()]
+            rows_b = [game[b] for game in games.values()]
+            won_a = [r["success"] for r in rows_a]
+            won_b = [r["success"] for r in rows_b]
+            only_a = sum(wa and not wb for wa, wb in zip(won_a, won_b))
+            only_b = sum(wb and not wa for wa, wb in zip(won_a, won_b))
+            fewer_a, fewer_b, explosions_p = _paired_test(
+                [r["explosions"] for r in rows_a], [r["explosions"] for r in rows_b]
+            )
+            timed = [
+                (ra, rb)
+                for ra, rb in zip(rows_a, rows_b)
+                if ra["moves"] and rb["moves"]
+            ]
+            faster_a, faster_b, time_p = _paired_test(
+                [ra["time_per_move"] for ra, _ in timed],
+                [rb["time_per_move"] for _, rb in timed],
+            )
+            pairs.append(
+                {
+                    "solvers": (a, b),
+                    "only_wins": (only_a, only_b),
+                    "wins_p": _binomial_test(only_a, only_a + only_b),
+                    "fewer_explosions": (fewer_a, fewer_b),
+                    "explosions_p": explosions_p,
+                    "faster_moves": (faster_a, faster_b),
+                    "time_p": time_p,
+                }
+            )
+        return solvers, pairs
+
+    def run_scaling(
+        self,
+        min_side=9,
+        max_side=2000,
+        area_factor=4.0,
+        density=15,
+        timeout=300.0,
+        step_timeout=60.0,
+    ):
+        """
+        Sweep board area geometrically and measure how each solver scales.
+
+        Every solve runs in its own process so that a solve exceeding
+        ``timeout``, or a single step exceeding ``step_timeout``, is killed and
+        recorded as a timeout instead of stalling the sweep. Once a solver
+        times out, larger boards are skipped for that solver.
+
+        Args:
+            min_side (int): Side of the smallest square board
+            max_side (int): Side of the largest square board
+            area_factor (float): Ratio between the areas of consecutive boards
+            density (int): Mine density in percent
+            timeout (float): Wall-clock limit for a whole solve, in seconds
+            step_timeout (float): Wall-clock limit for one solver step
+
+        Returns:
+            list: One result dict per (board size, solver)
+        """
+        rows = []
+        timed_out = set()
+        sizes = _geometric_sizes(min_side, max_side, area_factor)
+
+        total = len(sizes) * len(self.solver_types)
+        with _progress(total, "Scaling", self.progress) as pbar:
+            for width, height in sizes:
+                num_mines = int(width * height * density / 100)
+                for solver_type in self.solver_types:
+                    row = {
+                        "board_size": f"{width}x{height}",
+                        "cells": width * height,
+                        "density": density,
+                        "solver": solver_type,
+                        "num_mines": num_mines,
+                    }
+                    if solver_type in timed_out:
+                        row["status"] = "skipped"
+                    else:
+                        row.update(
+                            self._run_isolated(
+                                width,
+                                height,
+                                num_mines,
+                                solver_type,
+                                seed=width * height * density,
+                                timeout=timeout,
+                                step_timeout=step_timeout,
                             )
-                            self.results["time"].append(end_time - start_time)
-
-                            pbar.update(1)
-
-        self.df_results = pd.DataFrame(self.results)
-        return self.df_results
+                        )
+                        if row["status"] != "ok":
+                            timed_out.add(solver_type)
+                    rows.append(row)
+                    pbar.update(1)
+
+        self.scaling_results = rows
+        self._df_scaling = None
+        self.complexity = self._fit_complexity(rows)
+        return self.scaling_results
+
+    def _run_isolated(
+        self, width, height, num_mines, solver_type, seed, timeout, step_timeout
+    ):
+        """Run ``_scaling_worker`` in a child process and enforce the timeouts."""
+        heartbeat = multiprocessing.Value("d", time.monotonic())
+        parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=_scaling_worker,
+            args=(width, height, num_mines, solver_type, seed, heartbeat, child_conn),
+            daemon=True,
+        )
+        start = time.monotonic()
+        process.start()
+        child_conn.close()
+
+        status = "error"
+        try:
+            while True:
+                if parent_conn.poll(0.05):
+                    result = parent_conn.recv()
+                    result["status"] = "ok"
+                    return result
+                if not process.is_alive():
+                    if parent_conn.poll():
+                        continue
+                    break
+                now = time.monotonic()
+                if now - start > timeout:
+                    status = "timeout"
+                    break
+                if now - heartbeat.value > step_timeout:
+                    status = "step_timeout"
+                    break
+        except EOFError:
+            pass
+        finally:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        return {"status": status, "time": time.monotonic() - start}
+
+    def _fit_complexity(self, rows):
+        """
+        Fit empirical exponents ``k`` in ``cost ~ cells ** k`` for every solver.
+
+        Only completed solves are used, so the exponents describe the sizes a
+        solver actually finished.
+        """
+        complexity = {}
+        for solver_type in self.solver_types:
+            done = [
+                r for r in rows if r["solver"] == solver_type and r["status"] == "ok"
+            ]
+            cells = [r["cells"] for r in done]
+            complexity[solver_type] = {
+                "time_exponent": _fit_exponent(cells, [r["time"] for r in done]),
+                "memory_exponent": _fit_exponent(
+                    cells, [r["peak_memory"] or 0 for r in done]
+                ),
+                "largest_solved": max(cells) if cells else None,
+            }
+        return complexity
 
     def generate_reports(self, output_dir="benchmarks"):
-        if not hasattr(self, "df_results"):
+        """Draw the benchmark charts into ``output_dir`` (loads matplotlib)."""
+        if not self.results["solver"]:
             raise ValueError("No benchmark results available. Run benchmark first.")
 
+        os.makedirs(output_dir, exist_ok=True)
         self._plot_performance_by_density(
             save_path=os.path.join(output_dir, "performance_by_density.png")
         )
@@ -89,6 +704,8 @@ class MinesweeperBenchmark:
 
     def _plot_performance_by_density(self, save_path=None):
         """Plot performance metrics by mine density."""
+        import matplotlib.pyplot as plt
+
         # Create line plots for explosions and success rate by density
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
 
@@ -144,6 +761,9 @@ class MinesweeperBenchmark:
 
     def _plot_time_comparison(self, save_path=None):
         """Plot the average solution time for each solver type."""
+        import matplotlib.pyplot as plt
+        import numpy as np
+
         grouped = self.df_results.groupby(["board_size", "density", "solver"])
         time_data = grouped["time"].mean().reset_index()
 
@@ -205,21 +825,140 @@ class MinesweeperBenchmark:
         return plt.gcf()
 
 
-if __name__ == "__main__":
-    import os
+def _parse_size(value):
+    width, _, height = value.lower().partition("x")
+    return int(width), int(height or width)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Minesweeper solvers.")
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=_parse_size,
+        help="Board sizes as WIDTHxHEIGHT (default: 9x9 16x16 30x16)",
+    )
+    parser.add_argument(
+        "--densities", nargs="+", type=int, help="Mine densities in percent"
+    )
+    parser.add_argument("--solvers", nargs="+", help="Solver types to compare")
+    parser.add_argument("--trials", type=int, default=30)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes for the trials",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["table", "csv", "json"],
+        default="table",
+        help="table prints a summary, csv/json also write the raw results",
+    )
+    parser.add_argument(
+        "--plots", action="store_true", help="Draw PNG reports (needs matplotlib)"
+    )
+    parser.add_argument("--output-dir", default="benchmarks")
+    parser.add_argument("--no-progress", action="store_true")
+    parser.add_argument(
+        "--corpus",
+        help="Play the trials on the boards of a corpus generated by corpus.py",
+    )
+    parser.add_argument(
+        "--scaling",
+        action="store_true",
+        help="Run the board-area scaling sweep instead of the trials",
+    )
+    parser.add_argument(
+        "--tournament",
+        action="store_true",
+        help="Play every solver on the same boards and compare them pairwise",
+    )
+    parser.add_argument("--max-side", type=int, default=2000)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--step-timeout", type=float, default=60.0)
+    args = parser.parse_args(argv)
 
     benchmark = MinesweeperBenchmark(
-        num_trials=30,
+        board_sizes=args.sizes,
+        mine_densities=args.densities,
+        num_trials=args.trials,
+        solver_types=args.solvers,
+        workers=args.workers,
+        progress=not args.no_progress,
+        corpus=args.corpus,
     )
 
-    os.makedirs("benchmarks", exist_ok=True)
+    if args.tournament:
+        benchmark.run_tournament(args.solvers)
+        solvers, pairs = benchmark.tournament_summary()
+        print("\nTournament results:")
+        for row in solvers:
+            print(
+                f"  {row['solver']:<15} games={row['games']:<5}"
+                f" wins={row['win_rate']:6.1%}"
+                f" explosions={row['avg_explosions']:6.2f}"
+                f" time/move={row['ms_per_move']:.3f}ms"
+            )
+        print("\nPaired comparisons (boards where one side did better, p-value):")
+        for pair in pairs:
+            a, b = pair["solvers"]
+            print(
+                f"  {a} vs {b}:"
+                f" wins {pair['only_wins'][0]}-{pair['only_wins'][1]}"
+                f" (p={pair['wins_p']:.3g}),"
+                f" fewer explosions {pair['fewer_explosions'][0]}"
+                f"-{pair['fewer_explosions'][1]} (p={pair['explosions_p']:.3g}),"
+                f" faster moves {pair['faster_moves'][0]}"
+                f"-{pair['faster_moves'][1]} (p={pair['time_p']:.3g})"
+            )
+    elif args.scaling:
+        density = args.densities[0] if args.densities else 15
+        rows = benchmark.run_scaling(
+            max_side=args.max_side,
+            density=density,
+            timeout=args.timeout,
+            step_timeout=args.step_timeout,
+        )
+        print("\nScaling results:")
+        for row in rows:
+            detail = (
+                f"{row['time']:9.3f}s {(row['peak_memory'] or 0) / 1e6:9.1f} MB"
+                if row["status"] == "ok"
+                else row["status"]
+            )
+            print(f"  {row['board_size']:>11} {row['solver']:<12} {detail}")
+        print("\nEmpirical exponents (cost ~ cells ** k):")
+        for solver, fit in benchmark.complexity.items():
+            time_k, memory_k = fit["time_exponent"], fit["memory_exponent"]
+            print(
+                f"  {solver:<12}"
+                f" time k={'n/a' if time_k is None else f'{time_k:.2f}'}"
+                f" memory k={'n/a' if memory_k is None else f'{memory_k:.2f}'}"
+                f" largest solved={fit['largest_solved']}"
+            )
+    else:
+        benchmark.run_benchmark()
+        print("\nBenchmark Summary:")
+        for row in benchmark.summary():
+            print(
+                f"  {row['board_size']:>7} {row['density']:>3}% {row['solver']:<12}"
+                f" success={row['success_rate']:6.1%}"
+                f" explosions={row['avg_explosions']:6.2f}"
+                f" time={row['avg_time']:.4f}s"
+            )
+
+    if args.format != "table":
+        for path in benchmark.export(args.output_dir, fmt=args.format):
+            print(f"Results written to {path}")
 
-    results = benchmark.run_benchmark()
+    if args.plots and not (args.scaling or args.tournament):
+        print("Generating reports...")
+        benchmark.generate_reports(output_dir=args.output_dir)
+        print(f"All charts have been exported to the '{args.output_dir}' folder")
 
-    print("Generating reports...")
-    summary = benchmark.generate_reports(output_dir="benchmarks")
+    return 0
 
-    print("\nBenchmark Summary:")
-    print(summary)
 
-    print("All charts and data have been exported to the 'benchmarks' folder")
+if __name__ == "__main__":
+    sys.exit(main())
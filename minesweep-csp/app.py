@@ -1,6 +1,23 @@
-from flask import Flask, request, jsonify
+import itertools
+import os
+import sys
+import time
+from operator import attrgetter
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
 from backend import MinesweeperBackend
+from chunkedboard import tile_mines
+from corpus import BoardCorpus
+from metrics import (
+    CONTENT_TYPE,
+    SOLVER_BUCKETS,
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+)
+from solvers import registry
+from solvers.basesolver import neighbor_table
 
 app = Flask(__name__)
 CORS(
@@ -18,20 +35,103 @@ CORS(
 
 # Store active games
 games = {}
+# Ids are never reused, even after a game is deleted
+game_ids = itertools.count()
+# Cached mine probabilities per game id, built on first request
+probability_maps = {}
+# Pre-generated boards that new games can be played on (see corpus.py)
+corpus = (
+    BoardCorpus(os.environ["MINESWEEPER_CORPUS"])
+    if os.environ.get("MINESWEEPER_CORPUS")
+    else None
+)
+
+# Default time budget of an interactive solver move, in milliseconds
+DEFAULT_MOVE_BUDGET_MS = 500
+
+# Prometheus metrics served by /api/metrics
+metrics = Registry()
+REQUEST_LATENCY = metrics.register(
+    Histogram(
+        "minesweeper_request_duration_seconds",
+        "Time spent handling a request, by route.",
+        ("method", "route"),
+    )
+)
+REQUEST_COUNT = metrics.register(
+    Counter(
+        "minesweeper_requests_total",
+        "Requests handled, by route and status code.",
+        ("method", "route", "status"),
+    )
+)
+SOLVER_STEP_DURATION = metrics.register(
+    Histogram(
+        "minesweeper_solver_step_duration_seconds",
+        "Time spent computing a solver move, by solver and analysis tier.",
+        ("solver", "tier"),
+        buckets=SOLVER_BUCKETS,
+    )
+)
+metrics.register(
+    Gauge("minesweeper_active_games", "Games held by the server.", lambda: len(games))
+)
+metrics.register(
+    Gauge(
+        "minesweeper_board_cells",
+        "Board cells held in memory over all games.",
+        lambda: sum(game.cells_in_memory() for game in list(games.values())),
+    )
+)
+
+
+def _lazy_cache_info(module, name):
+    """Cache info getter that does not import ``module`` if nothing did yet."""
+
+    def cache_info():
+        loaded = sys.modules.get(module)
+        return attrgetter(name)(loaded)() if loaded else None
+
+    return cache_info
+
+
+metrics.register_cache("neighbor_table", neighbor_table.cache_info)
+metrics.register_cache("tile_mines", tile_mines.cache_info)
+# Solver modules are imported on first use, and so are their caches
+metrics.register_cache(
+    "board_layout", _lazy_cache_info("solvers.bitboard", "board_layout.cache_info")
+)
+metrics.register_cache(
+    "probabilities", _lazy_cache_info("solvers.probabilitymap", "cache_info")
+)
 
 
 @app.route("/api/game/new", methods=["POST"])
 def new_game():
-    """Create a new Minesweeper game."""
+    """
+    Create a new Minesweeper game.
+
+    With ``board_index``, the board is taken from the corpus named by the
+    ``MINESWEEPER_CORPUS`` environment variable instead of being generated.
+    """
     try:
         data = request.get_json()
         width = data.get("width", 9)
         height = data.get("height", 9)
         num_mines = data.get("num_mines", 10)
-        solver_type = data.get("solver_type", "basic")
+        solver_type = data.get("solver_type", registry.DEFAULT_SOLVER)
+        board_index = data.get("board_index")
+
+        if board_index is None:
+            game = MinesweeperBackend(width, height, num_mines, solver_type)
+        elif corpus is None or not corpus.count(width, height, num_mines):
+            return jsonify({"error": "No corpus boards for this configuration"}), 400
+        else:
+            index = board_index % corpus.count(width, height, num_mines)
+            game = corpus.board(width, height, num_mines, index, solver_type)
 
-        game_id = str(len(games))
-        games[game_id] = MinesweeperBackend(width, height, num_mines, solver_type)
+        game_id = str(next(game_ids))
+        games[game_id] = game
 
         return jsonify({"game_id": game_id, "state": games[game_id].get_game_state()})
     except Exception as e:
@@ -99,17 +199,44 @@ def toggle_flag(game_id):
 
 @app.route("/api/game/<game_id>/solve/next", methods=["GET"])
 def get_next_solve_move(game_id):
-    """Get the next move from the solver."""
+    """
+    Get the next move from the solver.
+
+    The optional ``budget_ms`` query parameter bounds the time spent on the
+    move (0 means no limit). The response reports the analysis tier that
+    produced the move and how much of the budget it used.
+    """
     if game_id not in games:
         return jsonify({"error": "Game not found"}), 404
 
+    budget_ms = request.args.get("budget_ms", DEFAULT_MOVE_BUDGET_MS, type=float)
+    if budget_ms < 0:
+        return jsonify({"error": "budget_ms must be a non-negative number"}), 400
+
     game = games[game_id]
-    next_move = game.solve_next_move()
+    previous_step = game.last_step
+    next_move = game.solve_next_move(budget_ms / 1000 if budget_ms else None)
+    if game.last_step is not previous_step:
+        SOLVER_STEP_DURATION.observe(
+            game.last_step["elapsed"],
+            game.solver_type,
+            game.last_step["tier"] or "none",
+        )
 
     if next_move is None:
         return jsonify({"error": "No moves available"}), 400
 
-    return jsonify({"x": next_move[0], "y": next_move[1]})
+    elapsed_ms = game.last_step["elapsed"] * 1000
+    return jsonify(
+        {
+            "x": next_move[0],
+            "y": next_move[1],
+            "tier": game.last_step["tier"],
+            "budget_ms": budget_ms or None,
+            "elapsed_ms": round(elapsed_ms, 3),
+            "budget_used": round(elapsed_ms / budget_ms, 4) if budget_ms else None,
+        }
+    )
 
 
 @app.route("/api/game/<game_id>/solve/apply", methods=["POST"])
@@ -147,26 +274,16 @@ def change_solver(game_id):
 
 @app.route("/api/solvers", methods=["GET"])
 def get_available_solvers():
-    """Get a list of available solver types."""
+    """
+    Get a list of available solver types, generated from the solver registry.
+
+    Listing the solvers does not import them; ``loaded`` tells which ones a
+    game already uses.
+    """
     return jsonify(
         {
-            "solvers": [
-                {
-                    "id": "greedy",
-                    "name": "Greedy Solver",
-                    "description": "A basic solver that makes random guesses without taking into account cells information",
-                },
-                {
-                    "id": "astar",
-                    "name": "A* Solver",
-                    "description": "An A* based solver that uses trivial moves and random guesses when needed",
-                },
-                {
-                    "id": "astar_boost",
-                    "name": "A* Boost",
-                    "description": "An enhanced A* solver with probabilistic frontier analysis for better mine probability estimation when no trivial moves is found",
-                },
-            ]
+            "solvers": [spec.describe() for spec in registry.specs()],
+            "default": registry.DEFAULT_SOLVER,
         }
     )
 
@@ -196,9 +313,57 @@ def delete_game(game_id):
         return jsonify({"error": "Game not found"}), 404
 
     del games[game_id]
+    probability_maps.pop(game_id, None)
     return jsonify({"message": "Game deleted successfully"})
 
 
+@app.route("/api/game/<game_id>/probabilities", methods=["GET"])
+def get_probabilities(game_id):
+    """
+    Get the mine probability of every hidden cell, for a heatmap overlay.
+
+    ``data`` is base64 of one byte per cell, row by row: ``round(p * scale)``
+    for unknown cells and ``known`` for revealed or flagged ones. The result
+    is cached until the next move on the game. ``budget_ms`` bounds the
+    analysis like for ``solve/next``.
+    """
+    if game_id not in games:
+        return jsonify({"error": "Game not found"}), 404
+
+    budget_ms = request.args.get("budget_ms", DEFAULT_MOVE_BUDGET_MS, type=float)
+    if budget_ms < 0:
+        return jsonify({"error": "budget_ms must be a non-negative number"}), 400
+
+    # Imported here so the frontier engine is only loaded when it is used
+    from solvers.probabilitymap import ProbabilityMap
+
+    game = games[game_id]
+    probability_map = probability_maps.get(game_id)
+    if probability_map is None or probability_map.game is not game:
+        probability_map = probability_maps[game_id] = ProbabilityMap(game)
+    deadline = time.perf_counter() + budget_ms / 1000 if budget_ms else None
+    try:
+        result, cached = probability_map.get(deadline)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({**result, "cached": cached})
+
+
+@app.route("/api/game/<game_id>/log", methods=["GET"])
+def get_move_log(game_id):
+    """Download the binary move log of a game, for ``replay.py``."""
+    if game_id not in games:
+        return jsonify({"error": "Game not found"}), 404
+
+    data = games[game_id].move_log.to_bytes()
+    return Response(
+        data,
+        mimetype="application/octet-stream",
+        headers={"Content-Disposition": f"attachment; filename=game-{game_id}.mlog"},
+    )
+
+
 @app.route("/api/game/<game_id>/explosions", methods=["GET"])
 def get_explosion_count(game_id):
     """Get the number of explosions for a specific game."""
@@ -233,10 +398,27 @@ def health_check():
     return jsonify({"status": "ok"})
 
 
+@app.route("/api/metrics", methods=["GET"])
+def get_metrics():
+    """Server metrics in the Prometheus text format."""
+    return Response(metrics.render(), mimetype=CONTENT_TYPE)
+
+
+@app.before_request
+def before_request():
+    g.request_start = time.perf_counter()
+
+
 # Add a preflight handler for OPTIONS requests
 @app.after_request
 def after_request(response):
     response.headers.add("Access-Control-Allow-Credentials", "true")
+    start = g.pop("request_start", None)
+    if start is not None:
+        # Route templates keep one series per endpoint, not one per game
+        route = request.url_rule.rule if request.url_rule else "unmatched"
+        REQUEST_LATENCY.observe(time.perf_counter() - start, request.method, route)
+        REQUEST_COUNT.inc(request.method, route, str(response.status_code))
     return response
 
 
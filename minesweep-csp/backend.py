@@ -1,28 +1,52 @@
+from contextlib import contextmanager
 from typing import Tuple, Optional
 import random
-from solvers.astarsolver import AstarSolver
-from solvers.astarboostedsolver import AstarBoostedSolver
-from solvers.greedysolver import GreedySolver
+import time
+from movelog import FLAG, REVEAL, MoveLog
+from solvers import registry
 
 
 class SolverFactory:
-    """Factory for creating different solver instances."""
+    """
+    Factory for creating different solver instances.
+
+    Solvers are declared in ``solvers/registry.py`` and their modules are
+    only imported when a game first uses them.
+    """
+
+    register = staticmethod(registry.register)
+    solver_types = staticmethod(registry.solver_ids)
 
     @staticmethod
     def create_solver(solver_type, game):
-        if solver_type == "basic":
-            return GreedySolver(game)
-        elif solver_type == "astar":
-            return AstarSolver(game)
-        elif solver_type == "astar_boost":
-            return AstarBoostedSolver(game)
-        else:
-            return GreedySolver(game)
+        """
+        Raises:
+            ValueError: If ``solver_type`` is not a registered solver
+        """
+        return registry.create(solver_type, game)
+
+    @staticmethod
+    def solver_id(solver_type):
+        """
+        Canonical id of ``solver_type``, with aliases resolved.
+
+        Raises:
+            ValueError: If ``solver_type`` is not a registered solver
+        """
+        return registry.get(solver_type).id
 
 
 class MinesweeperBackend:
+    dense = True  # Every cell is stored in per-row lists
+
     def __init__(
-        self, width: int, height: int, num_mines: int, solver_type: str = "basic"
+        self,
+        width: int,
+        height: int,
+        num_mines: int,
+        solver_type: str = "greedy",
+        seed: Optional[int] = None,
+        grid: Optional[list] = None,
     ):
         """
         Initialize a new Minesweeper game backend.
@@ -31,26 +55,44 @@ class MinesweeperBackend:
             width (int): Width of the game board
             height (int): Height of the game board
             num_mines (int): Number of mines to place
-            solver_type (str): Type of solver to use ('basic', 'astar', 'astar_boost')
+            solver_type (str): Id of a solver of ``solvers/registry.py`` ('greedy'
+                or its alias 'basic', 'astar', 'astar_boost', 'astar_bitboard').
+                ``self.solver_type`` holds the id an alias resolves to
+            seed (Optional[int]): Seed of the mine layout (0 to 2**64 - 1), drawn
+                from ``random`` if None; the same seed gives the same board
+            grid (Optional[list]): Precomputed cell values (-1 for mines), e.g.
+                from a board corpus, used instead of placing the mines; it
+                must be the layout generated from ``seed``
         """
         self.width = width
         self.height = height
         self.num_mines = num_mines
-        self.grid = [[0 for _ in range(width)] for _ in range(height)]
+        self.seed = seed if seed is not None else random.getrandbits(64)
         self.revealed = [[False for _ in range(width)] for _ in range(height)]
         self.flagged = [[False for _ in range(width)] for _ in range(height)]
         self.game_over = False
         self.won = False
-        self.solver_type = solver_type
-        self._place_mines()
-        self._calculate_numbers()
-        self.solver = SolverFactory.create_solver(solver_type, self)
+        self.solver_type = SolverFactory.solver_id(solver_type)
+        self._journal = None  # Undo log, only kept while a snapshot is open
+        self._snapshot_depth = 0
+        self.version = 0  # Incremented whenever a cell is revealed or flagged
+        if grid is None:
+            self.grid = [[0 for _ in range(width)] for _ in range(height)]
+            self._place_mines()
+            self._calculate_numbers()
+        else:
+            self.grid = grid
+        self._sync_counters()
+        self.solver = SolverFactory.create_solver(self.solver_type, self)
         self.nb_explosions = 0
+        self.last_step = None  # Tier and timing of the last solver step
+        self.move_log = MoveLog.for_game(self)
+        self._move_source = None  # (tier, elapsed) while a solver move is applied
 
     def _place_mines(self):
-        """Place mines randomly on the board."""
+        """Place mines on the board, randomly but reproducibly from ``seed``."""
         positions = [(x, y) for x in range(self.width) for y in range(self.height)]
-        mine_positions = random.sample(positions, self.num_mines)
+        mine_positions = random.Random(self.seed).sample(positions, self.num_mines)
         for x, y in mine_positions:
             self.grid[y][x] = -1  # -1 represents a mine
 
@@ -87,24 +129,15 @@ class MinesweeperBackend:
             return True
         if self.flagged[y][x] or self.revealed[y][x]:
             return True
-
-        self.revealed[y][x] = True
+        self._log_move(REVEAL, x, y)
+        self.version += 1
 
         if self.grid[y][x] == -1:
             self.nb_explosions += 1
-            self.revealed[y][x] = False
-            self.toggle_flag(x, y)
+            self._toggle_flag(x, y)
             return True
 
-        if self.grid[y][x] == 0:
-            for dy in [-1, 0, 1]:
-                for dx in [-1, 0, 1]:
-                    nx, ny = x + dx, y + dy
-                    if (dx == 0 and dy == 0) or not (
-                        0 <= nx < self.width and 0 <= ny < self.height
-                    ):
-                        continue
-                    self.reveal(nx, ny)
+        self._flood_reveal(x, y)
 
         if self._check_win():
             self.won = True
@@ -112,6 +145,44 @@ class MinesweeperBackend:
 
         return not self.game_over
 
+    def _flood_reveal(self, x: int, y: int):
+        """
+        Reveal a safe cell and, iteratively, every cell reachable through zeros.
+
+        An explicit stack is used instead of recursion so large empty regions
+        do not hit the interpreter recursion limit.
+
+        Args:
+            x (int): X coordinate of a safe, hidden cell
+            y (int): Y coordinate of a safe, hidden cell
+        """
+        width = self.width
+        journal = self._journal
+        stack = [(x, y)]
+        self.revealed[y][x] = True
+        if journal is not None:
+            journal.append(y * width + x)
+        opened = 1
+        while stack:
+            cx, cy = stack.pop()
+            if self.grid[cy][cx] != 0:
+                continue
+            for dy in [-1, 0, 1]:
+                for dx in [-1, 0, 1]:
+                    nx, ny = cx + dx, cy + dy
+                    if (dx == 0 and dy == 0) or not (
+                        0 <= nx < self.width and 0 <= ny < self.height
+                    ):
+                        continue
+                    if self.flagged[ny][nx] or self.revealed[ny][nx]:
+                        continue
+                    self.revealed[ny][nx] = True
+                    if journal is not None:
+                        journal.append(ny * width + nx)
+                    opened += 1
+                    stack.append((nx, ny))
+        self._hidden_safe -= opened
+
     def toggle_flag(self, x: int, y: int):
         """
         Toggle the flag state of a cell.
@@ -123,22 +194,223 @@ class MinesweeperBackend:
         if not (0 <= x < self.width and 0 <= y < self.height):
             return
         if not self.revealed[y][x]:
-            self.flagged[y][x] = not self.flagged[y][x]
+            self._log_move(FLAG, x, y)
+        self._toggle_flag(x, y)
+
+    def _toggle_flag(self, x: int, y: int):
+        """Toggle a flag without logging it, as explosions flag the mine."""
+        if not self.revealed[y][x]:
+            self._flip_flag(x, y)
+            self.version += 1
+            if self._journal is not None:
+                self._journal.append(~(y * self.width + x))
         if self._check_win():
             self.won = True
             self.game_over = True
 
+    def _log_move(self, action: int, x: int, y: int):
+        """
+        Append an action to ``move_log``.
+
+        Hypothetical moves (made while a snapshot is open) are not logged.
+        Actions applied by ``apply_solver_move`` carry the tier of the solver
+        step, and the first one its duration.
+        """
+        if self.move_log is None or self._snapshot_depth:
+            return
+        source = self._move_source
+        if source is None:
+            self.move_log.append(action, x, y)
+            return
+        tier, elapsed = source
+        self.move_log.append(
+            action,
+            x,
+            y,
+            solver=True,
+            step=elapsed is not None,
+            tier=tier,
+            elapsed=elapsed or 0.0,
+        )
+        self._move_source = (tier, None)
+
+    def _flip_flag(self, x: int, y: int):
+        """Toggle a flag and keep the win counters in sync."""
+        flagged = not self.flagged[y][x]
+        self.flagged[y][x] = flagged
+        delta = 1 if flagged else -1
+        self.flag_count += delta
+        if self.grid[y][x] == -1:
+            self._unflagged_mines -= delta
+
+    def _sync_counters(self):
+        """
+        Recompute the counters behind ``_check_win`` from the board lists.
+
+        Only needed after the lists were replaced or edited directly; the
+        public move methods keep the counters up to date incrementally.
+        """
+        hidden_safe = unflagged_mines = flag_count = 0
+        for grid_row, revealed_row, flagged_row in zip(
+            self.grid, self.revealed, self.flagged
+        ):
+            for value, revealed, flagged in zip(grid_row, revealed_row, flagged_row):
+                if flagged:
+                    flag_count += 1
+                if value == -1:
+                    if not flagged:
+                        unflagged_mines += 1
+                elif not revealed:
+                    hidden_safe += 1
+        self.flag_count = flag_count
+        self._hidden_safe = hidden_safe
+        self._unflagged_mines = unflagged_mines
+
     def _check_win(self) -> bool:
         """Check if the game has been won."""
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y][x] == -1 and not self.flagged[y][x]:
-                    return False
-                if self.grid[y][x] != -1 and not self.revealed[y][x]:
-                    return False
+        if self._hidden_safe or self._unflagged_mines:
+            return False
         print("Game won")
         return True
 
+    def revealed_cells(self):
+        """
+        Iterate over the revealed cells, row by row.
+
+        Solvers scan the board through this method and ``guess_candidates``
+        rather than looping over every coordinate, so boards that only store
+        the explored area can restrict the scan to it.
+
+        Yields:
+            Tuple[int, int]: Coordinates of a revealed cell
+        """
+        for y, row in enumerate(self.revealed):
+            for x, revealed in enumerate(row):
+                if revealed:
+                    yield x, y
+
+    def guess_candidates(self) -> list:
+        """
+        Cells a solver may pick when it has to guess.
+
+        Returns:
+            list: Coordinates of every hidden, unflagged cell
+        """
+        return [
+            (x, y)
+            for y in range(self.height)
+            for x in range(self.width)
+            if not self.revealed[y][x] and not self.flagged[y][x]
+        ]
+
+    def unknown_count(self) -> int:
+        """Number of cells that are neither revealed nor flagged."""
+        revealed = self.width * self.height - self.num_mines - self._hidden_safe
+        return self.width * self.height - revealed - self.flag_count
+
+    def cells_in_memory(self) -> int:
+        """Number of board cells currently held in memory."""
+        return self.width * self.height
+
+    def snapshot(self) -> tuple:
+        """
+        Mark the current state so that later moves can be undone.
+
+        While at least one snapshot is open, every reveal and flag toggle is
+        appended to an undo journal; ``restore`` rolls back to the mark in
+        time proportional to the number of cells changed since. Snapshots
+        can be nested.
+
+        Returns:
+            tuple: Opaque token to pass to ``restore`` or ``release``
+        """
+        if self._journal is None:
+            self._journal = []
+        self._snapshot_depth += 1
+        return (len(self._journal), self.game_over, self.won, self.nb_explosions)
+
+    def restore(self, token: tuple):
+        """
+        Undo every move made since ``token`` was taken and close the snapshot.
+
+        Args:
+            token (tuple): Value returned by ``snapshot``
+        """
+        mark, self.game_over, self.won, self.nb_explosions = token
+        journal = self._journal
+        self.version += 1
+        width = self.width
+        while len(journal) > mark:
+            entry = journal.pop()
+            if entry >= 0:
+                y, x = divmod(entry, width)
+                self.revealed[y][x] = False
+                self._hidden_safe += 1
+            else:
+                y, x = divmod(~entry, width)
+                self._flip_flag(x, y)
+        self.release(token)
+
+    def release(self, token: tuple):
+        """
+        Close a snapshot and keep the moves made since it was taken.
+
+        Args:
+            token (tuple): Value returned by ``snapshot``
+        """
+        self._snapshot_depth -= 1
+        if self._snapshot_depth == 0:
+            self._journal = None
+
+    @contextmanager
+    def hypothetical(self):
+        """
+        Context manager for "what if" analysis.
+
+        Moves made inside the block are rolled back on exit::
+
+            with game.hypothetical():
+                game.reveal(x, y)
+                outcome = game.get_game_state()
+        """
+        token = self.snapshot()
+        try:
+            yield self
+        finally:
+            self.restore(token)
+
+    def clone(self, solver_type: Optional[str] = None) -> "MinesweeperBackend":
+        """
+        Create an independent copy of the game for look-ahead search.
+
+        The mine layout is never modified after placement, so ``grid`` is
+        shared with the clone; only the ``revealed`` and ``flagged`` rows are
+        copied. Moves made on the clone are not logged.
+
+        Args:
+            solver_type (str): Solver for the clone, defaults to this game's
+
+        Returns:
+            MinesweeperBackend: The copy
+        """
+        other = object.__new__(type(self))
+        other.__dict__.update(self.__dict__)
+        self._copy_cells(other)
+        other._journal = None
+        other._snapshot_depth = 0
+        other.move_log = None
+        other._move_source = None
+        other.solver_type = (
+            SolverFactory.solver_id(solver_type) if solver_type else self.solver_type
+        )
+        other.solver = SolverFactory.create_solver(other.solver_type, other)
+        return other
+
+    def _copy_cells(self, other: "MinesweeperBackend"):
+        """Give ``other`` its own copy of the mutable cell state."""
+        other.revealed = [row[:] for row in self.revealed]
+        other.flagged = [row[:] for row in self.flagged]
+
     def get_game_state(self) -> dict:
         """
         Get the current state of the game.
@@ -165,21 +437,42 @@ class MinesweeperBackend:
 
         Args:
             solver_type (str): The new solver type
+
+        Raises:
+            ValueError: If ``solver_type`` is not a registered solver
         """
-        self.solver_type = solver_type
         self.solver = SolverFactory.create_solver(solver_type, self)
+        self.solver_type = SolverFactory.solver_id(solver_type)
 
-    def solve_next_move(self) -> Optional[Tuple[int, int]]:
+    def solve_next_move(
+        self, budget: Optional[float] = None
+    ) -> Optional[Tuple[int, int]]:
         """
         Get the next move from the solver.
 
+        The analysis tier that produced the move and the time it took are
+        stored in ``last_step``.
+
+        Args:
+            budget (Optional[float]): Seconds the solver may spend on the move;
+                past it the best move found so far is returned. None means no
+                limit
+
         Returns:
             Optional[Tuple[int, int]]: The next move coordinates or None if no move is available
         """
         if self.game_over:
             return None
 
-        if self.solver.solve_step():
+        start = time.perf_counter()
+        deadline = None if budget is None else start + budget
+        found = self.solver.solve_step(deadline)
+        self.last_step = {
+            "tier": self.solver.tier,
+            "elapsed": time.perf_counter() - start,
+            "budget": budget,
+        }
+        if found:
             if self.solver.safe_moves:
                 return self.solver.safe_moves[0]
             if self.solver.flagged_cells:
@@ -195,27 +488,41 @@ class MinesweeperBackend:
         """
         print("Applying solver move")
         print("Actual count of explosions: ", self.nb_explosions)
-        return self.solver.apply_moves()
+        step = self.last_step or {"tier": None, "elapsed": 0.0}
+        self._move_source = (step["tier"], step["elapsed"])
+        try:
+            return self.solver.apply_moves()
+        finally:
+            self._move_source = None
 
     def reset_game(self):
-        """Reset the game to its initial state."""
+        """Reset the game on a new mine layout, with a new move log."""
         print("Resetting game")
+        self.seed = random.getrandbits(64)
         self.grid = [[0 for _ in range(self.width)] for _ in range(self.height)]
         self.revealed = [[False for _ in range(self.width)] for _ in range(self.height)]
         self.flagged = [[False for _ in range(self.width)] for _ in range(self.height)]
         self.game_over = False
         self.won = False
+        self._journal = None
+        self._snapshot_depth = 0
+        self.version += 1
         self._place_mines()
         self._calculate_numbers()
+        self._sync_counters()
         self.solver = SolverFactory.create_solver(self.solver_type, self)
         self.nb_explosions = 0
+        self.move_log = MoveLog.for_game(self)
 
-    def solve_game(self, max_iterations: int = 1000) -> dict:
+    def solve_game(
+        self, max_iterations: int = 1000, move_budget: Optional[float] = None
+    ) -> dict:
         """
         Attempt to solve the entire Minesweeper game in one go.
 
         Args:
             max_iterations (int): Maximum number of solver steps to prevent infinite loops
+            move_budget (Optional[float]): Seconds allowed per move, None for no limit
 
         Returns:
             dict: A dictionary containing game solve results
@@ -231,14 +538,14 @@ class MinesweeperBackend:
         # Attempt to solve the game
         while not self.game_over and iterations < max_iterations:
             # Try to get and apply the next solver move
-            move = self.solve_next_move()
+            move = self.solve_next_move(move_budget)
 
             # If no move is available, break the loop
             if move is None:
                 break
 
             # Apply the solver move
-            move_result = self.apply_solver_move()
+            self.apply_solver_move()
 
             # Increment iterations
             iterations += 1
@@ -0,0 +1,483 @@
+import hashlib
+import random
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+
+from backend import MinesweeperBackend, SolverFactory
+from movelog import MoveLog
+
+DEFAULT_TILE_SIZE = 64
+DEFAULT_DENSITY = 0.15
+# Untouched tiles kept in memory before the least recently used are dropped
+DEFAULT_MAX_CACHED_TILES = 1024
+
+
+@lru_cache(maxsize=256)
+def tile_mines(seed, tx, ty, tile_size, tile_width, tile_height, count):
+    """
+    Mine positions of one tile, derived from a hash of (seed, tile).
+
+    The layout only depends on its arguments, so a tile can be dropped and
+    rebuilt identically at any time, in any process.
+
+    Args:
+        seed (int): Seed of the board
+        tx (int): Tile column
+        ty (int): Tile row
+        tile_size (int): Nominal tile side, used as the row stride
+        tile_width (int): Columns of this tile (less on the right edge)
+        tile_height (int): Rows of this tile (less on the bottom edge)
+        count (int): Number of mines in the tile
+
+    Returns:
+        tuple: Sorted local indices ``ly * tile_size + lx`` of the mines
+    """
+    digest = hashlib.blake2b(
+        f"{seed}:{tx}:{ty}".encode(), digest_size=8, person=b"minesweep"
+    ).digest()
+    rng = random.Random(int.from_bytes(digest, "little"))
+    cells = [
+        ly * tile_size + lx for ly in range(tile_height) for lx in range(tile_width)
+    ]
+    return tuple(sorted(rng.sample(cells, count)))
+
+
+# A tile is a list of three arrays indexed by ``ly * tile_size + lx``: the
+# cell values (number of adjacent mines, -1 for a mine), then the revealed
+# and flagged bytes. Lists keep the per-cell lookups cheap.
+VALUES, REVEALED, FLAGGED = range(3)
+# Row views cached per layer before the cache is reset
+MAX_CACHED_ROWS = 4096
+
+
+def _new_tile(values):
+    return [values, bytearray(len(values)), bytearray(len(values))]
+
+
+def _copy_tile(tile):
+    """Copy the player state of a tile; the values never change and are shared."""
+    return [tile[VALUES], tile[REVEALED][:], tile[FLAGGED][:]]
+
+
+class _TileRow:
+    """
+    One board row of a ``_TileLayer``, indexable by x.
+
+    The tiles crossed by the row are remembered until the board evicts a
+    tile, which bumps its generation.
+    """
+
+    __slots__ = ("_board", "_layer", "_ty", "_offset", "_tiles", "_generation")
+
+    def __init__(self, board, layer, y):
+        self._board = board
+        self._layer = layer
+        self._ty, local_y = divmod(y, board.tile_size)
+        self._offset = local_y * board.tile_size
+        self._tiles = {}
+        self._generation = board._generation
+
+    def __len__(self):
+        return self._board.width
+
+    def __iter__(self):
+        raise TypeError("rows of a chunked board cannot be iterated")
+
+    def __getitem__(self, x):
+        board = self._board
+        if self._generation != board._generation:
+            self._tiles = {}
+            self._generation = board._generation
+        tx, local_x = divmod(x, board.tile_size)
+        tile = self._tiles.get(tx)
+        if tile is None:
+            tile = self._tiles[tx] = board._tile(tx, self._ty)
+        return tile[self._layer][self._offset + local_x]
+
+    def __setitem__(self, x, value):
+        tx, local_x = divmod(x, self._board.tile_size)
+        tile = self._board._tile(tx, self._ty, touch=True)
+        tile[self._layer][self._offset + local_x] = value
+
+
+class _TileLayer:
+    """
+    ``layer[y][x]`` view of one tile array over the whole board.
+
+    It stands in for the per-row lists of ``MinesweeperBackend`` so the
+    inherited game logic and the solvers work unchanged on chunked boards.
+    """
+
+    __slots__ = ("_board", "_layer", "_rows")
+
+    def __init__(self, board, layer):
+        self._board = board
+        self._layer = layer
+        self._rows = {}
+
+    def __len__(self):
+        return self._board.height
+
+    def __iter__(self):
+        # Walking a huge board row by row would build every tile
+        raise TypeError("a chunked board cannot be iterated; read a window")
+
+    def __getitem__(self, y):
+        row = self._rows.get(y)
+        if row is None:
+            if len(self._rows) >= MAX_CACHED_ROWS:
+                self._rows = {}
+            row = self._rows[y] = _TileRow(self._board, self._layer, y)
+        return row
+
+
+class ChunkedMinesweeperBackend(MinesweeperBackend):
+    """
+    Minesweeper game on a lazily generated board split in square tiles.
+
+    The mines of each tile come from a hash of (seed, tile coordinates), so
+    tiles are only built when a cell in them is first read. Tiles the player
+    never changed are kept in a bounded LRU cache and rebuilt on demand;
+    tiles holding a reveal or a flag stay in memory. Memory therefore grows
+    with the explored area, not with the board size, and boards can be far
+    larger than what fits as Python lists.
+    """
+
+    dense = False
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        density: float = DEFAULT_DENSITY,
+        solver_type: str = "greedy",
+        seed: Optional[int] = None,
+        tile_size: int = DEFAULT_TILE_SIZE,
+        max_cached_tiles: int = DEFAULT_MAX_CACHED_TILES,
+    ):
+        """
+        Initialize a new chunked Minesweeper game.
+
+        Args:
+            width (int): Width of the game board
+            height (int): Height of the game board
+            density (float): Fraction of mines in every tile
+            solver_type (str): Type of solver to use
+            seed (int): Seed of the mine layout (0 to 2**64 - 1), random if None
+            tile_size (int): Side of a tile in cells
+            max_cached_tiles (int): Untouched tiles kept in memory
+        """
+        self.width = width
+        self.height = height
+        self.density = density
+        self.tile_size = tile_size
+        self.max_cached_tiles = max_cached_tiles
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.num_mines = self._count_mines()
+        self._touched = {}  # Tiles with a reveal or a flag, never evicted
+        self._cache = OrderedDict()  # Untouched tiles, least recently used first
+        self._generation = 0  # Bumped whenever a tile is evicted
+        self._make_layers()
+        self.game_over = False
+        self.won = False
+        self.solver_type = SolverFactory.solver_id(solver_type)
+        self._journal = None
+        self._snapshot_depth = 0
+        self.version = 0
+        self._sync_counters()
+        self.solver = SolverFactory.create_solver(self.solver_type, self)
+        self.nb_explosions = 0
+        self.last_step = None
+        self.move_log = MoveLog.for_game(self)
+        self._move_source = None
+
+    def _make_layers(self):
+        self.grid = _TileLayer(self, VALUES)
+        self.revealed = _TileLayer(self, REVEALED)
+        self.flagged = _TileLayer(self, FLAGGED)
+
+    def _tile_shape(self, tx: int, ty: int) -> tuple:
+        """Columns and rows of a tile; tiles on the right and bottom edges are cut."""
+        size = self.tile_size
+        return (
+            min(size, self.width - tx * size),
+            min(size, self.height - ty * size),
+        )
+
+    def _tile_mine_count(self, tile_width: int, tile_height: int) -> int:
+        return round(self.density * tile_width * tile_height)
+
+    def _count_mines(self) -> int:
+        """Total mines, computed per tile shape without building any tile."""
+        size = self.tile_size
+        full_x, rest_x = divmod(self.width, size)
+        full_y, rest_y = divmod(self.height, size)
+        total = 0
+        for tile_width, columns in ((size, full_x), (rest_x, 1 if rest_x else 0)):
+            for tile_height, rows in ((size, full_y), (rest_y, 1 if rest_y else 0)):
+                total += columns * rows * self._tile_mine_count(tile_width, tile_height)
+        return total
+
+    def _mines(self, tx: int, ty: int) -> tuple:
+        tile_width, tile_height = self._tile_shape(tx, ty)
+        return tile_mines(
+            self.seed,
+            tx,
+            ty,
+            self.tile_size,
+            tile_width,
+            tile_height,
+            self._tile_mine_count(tile_width, tile_height),
+        )
+
+    def _build_tile(self, tx: int, ty: int) -> list:
+        """Generate a tile: its mines and the numbers of its cells."""
+        size = self.tile_size
+        tile_width, tile_height = self._tile_shape(tx, ty)
+        counts = array("b", bytes(size * size))
+        # Spread every mine of this tile and of the bordering cells of the
+        # 8 neighbouring tiles onto the cells around it
+        for ny in range(max(0, ty - 1), min(self._tile_rows(), ty + 2)):
+            for nx in range(max(0, tx - 1), min(self._tile_columns(), tx + 2)):
+                offset_x = (nx - tx) * size
+                offset_y = (ny - ty) * size
+                for index in self._mines(nx, ny):
+                    my, mx = divmod(index, size)
+                    mx += offset_x
+                    my += offset_y
+                    if not (-1 <= mx <= tile_width and -1 <= my <= tile_height):
+                        continue
+                    for cy in range(max(0, my - 1), min(tile_height, my + 2)):
+                        row = cy * size
+                        for cx in range(max(0, mx - 1), min(tile_width, mx + 2)):
+                            counts[row + cx] += 1
+        for index in self._mines(tx, ty):
+            counts[index] = -1
+        return _new_tile(counts)
+
+    def _tile_columns(self) -> int:
+        return -(-self.width // self.tile_size)
+
+    def _tile_rows(self) -> int:
+        return -(-self.height // self.tile_size)
+
+    def _tile(self, tx: int, ty: int, touch: bool = False) -> list:
+        """
+        Get a tile, building it on first use.
+
+        Args:
+            tx (int): Tile column
+            ty (int): Tile row
+            touch (bool): The caller is about to change the tile, which pins
+                it in memory
+
+        Returns:
+            list: The tile arrays, see ``VALUES``
+        """
+        key = (tx, ty)
+        tile = self._touched.get(key)
+        if tile is not None:
+            return tile
+        tile = self._cache.pop(key, None)
+        if tile is None:
+            tile = self._build_tile(tx, ty)
+        if touch:
+            self._touched[key] = tile
+        else:
+            self._cache[key] = tile
+            if len(self._cache) > self.max_cached_tiles:
+                self._cache.popitem(last=False)
+                self._generation += 1
+        return tile
+
+    def loaded_tiles(self) -> dict:
+        """Number of tiles in memory, pinned by the player or merely cached."""
+        return {"touched": len(self._touched), "cached": len(self._cache)}
+
+    def cells_in_memory(self) -> int:
+        """Cells of the tiles in memory; the rest of the board is virtual."""
+        return sum(
+            len(tile[VALUES])
+            for tiles in (self._touched, self._cache)
+            for tile in tiles.values()
+        )
+
+    def _place_mines(self):
+        """Mines are derived per tile from the seed; nothing to place."""
+
+    def _calculate_numbers(self):
+        """Numbers are computed when a tile is built."""
+
+    def _flood_reveal(self, x: int, y: int):
+        """
+        Reveal a safe cell and every cell reachable through zeros.
+
+        Same walk as ``MinesweeperBackend._flood_reveal``, reading the tiles
+        directly instead of going through the row views.
+        """
+        size = self.tile_size
+        width, height = self.width, self.height
+        journal = self._journal
+        tiles = {}
+
+        def cell(cx, cy):
+            key = (cx // size, cy // size)
+            tile = tiles.get(key)
+            if tile is None:
+                tile = tiles[key] = self._tile(*key, touch=True)
+            return tile, (cy % size) * size + cx % size
+
+        tile, index = cell(x, y)
+        tile[REVEALED][index] = True
+        if journal is not None:
+            journal.append(y * width + x)
+        opened = 1
+        stack = [(x, y, tile[VALUES][index])]
+        while stack:
+            cx, cy, value = stack.pop()
+            if value != 0:
+                continue
+            for ny in range(max(0, cy - 1), min(height, cy + 2)):
+                for nx in range(max(0, cx - 1), min(width, cx + 2)):
+                    tile, index = cell(nx, ny)
+                    if tile[FLAGGED][index] or tile[REVEALED][index]:
+                        continue
+                    tile[REVEALED][index] = True
+                    if journal is not None:
+                        journal.append(ny * width + nx)
+                    opened += 1
+                    stack.append((nx, ny, tile[VALUES][index]))
+        self._hidden_safe -= opened
+
+    def _sync_counters(self):
+        """Recompute the win counters from the touched tiles only."""
+        revealed = flag_count = flagged_mines = 0
+        for tile in self._touched.values():
+            revealed += tile[REVEALED].count(1)
+            for index, flagged in enumerate(tile[FLAGGED]):
+                if flagged:
+                    flag_count += 1
+                    if tile[VALUES][index] == -1:
+                        flagged_mines += 1
+        self.flag_count = flag_count
+        self._hidden_safe = self.width * self.height - self.num_mines - revealed
+        self._unflagged_mines = self.num_mines - flagged_mines
+
+    def _tile_origin(self, key: tuple) -> tuple:
+        return key[0] * self.tile_size, key[1] * self.tile_size
+
+    def revealed_cells(self):
+        """Iterate over the revealed cells of the touched tiles."""
+        size = self.tile_size
+        for key, tile in list(self._touched.items()):
+            origin_x, origin_y = self._tile_origin(key)
+            revealed = tile[REVEALED]
+            index = revealed.find(1)
+            while index != -1:
+                local_y, local_x = divmod(index, size)
+                yield origin_x + local_x, origin_y + local_y
+                index = revealed.find(1, index + 1)
+
+    def guess_candidates(self) -> list:
+        """
+        Hidden, unflagged cells of the explored area.
+
+        The explored area is every touched tile and its neighbours; before
+        the first move it is the tile at the centre of the board.
+        """
+        if self._touched:
+            keys = set()
+            for tx, ty in self._touched:
+                for ny in range(max(0, ty - 1), min(self._tile_rows(), ty + 2)):
+                    for nx in range(max(0, tx - 1), min(self._tile_columns(), tx + 2)):
+                        keys.add((nx, ny))
+        else:
+            keys = {
+                (self.width // 2 // self.tile_size, self.height // 2 // self.tile_size)
+            }
+
+        size = self.tile_size
+        candidates = []
+        for key in sorted(keys):
+            tile = self._tile(*key)
+            origin_x, origin_y = self._tile_origin(key)
+            tile_width, tile_height = self._tile_shape(*key)
+            for local_y in range(tile_height):
+                row = local_y * size
+                for local_x in range(tile_width):
+                    index = row + local_x
+                    if not tile[REVEALED][index] and not tile[FLAGGED][index]:
+                        candidates.append((origin_x + local_x, origin_y + local_y))
+        return candidates
+
+    def _copy_cells(self, other: "ChunkedMinesweeperBackend"):
+        """Copy the touched tiles; untouched ones are rebuilt from the seed."""
+        other._touched = {key: _copy_tile(tile) for key, tile in self._touched.items()}
+        other._cache = OrderedDict()
+        other._generation = 0
+        other._make_layers()
+
+    def get_game_state(
+        self,
+        x: int = 0,
+        y: int = 0,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+    ) -> dict:
+        """
+        Get the state of a window of the board.
+
+        Args:
+            x (int): Left column of the window
+            y (int): Top row of the window
+            width (int): Columns of the window, one tile by default
+            height (int): Rows of the window, one tile by default
+
+        Returns:
+            dict: Same keys as ``MinesweeperBackend.get_game_state``, with the
+                cell lists limited to the window described by ``window``
+        """
+        width = min(width or self.tile_size, self.width - x)
+        height = min(height or self.tile_size, self.height - y)
+        rows = range(y, y + height)
+        columns = range(x, x + width)
+        return {
+            "grid": [[self.grid[row][col] for col in columns] for row in rows],
+            "revealed": [
+                [bool(self.revealed[row][col]) for col in columns] for row in rows
+            ],
+            "flagged": [
+                [bool(self.flagged[row][col]) for col in columns] for row in rows
+            ],
+            "game_over": self.game_over,
+            "won": self.won,
+            "width": self.width,
+            "height": self.height,
+            "num_mines": self.num_mines,
+            "solver_type": self.solver_type,
+            "explosions": self.nb_explosions,
+            "window": {"x": x, "y": y, "width": width, "height": height},
+            "seed": self.seed,
+            "tile_size": self.tile_size,
+            "tiles": self.loaded_tiles(),
+        }
+
+    def reset_game(self):
+        """Reset the game on a new mine layout."""
+        print("Resetting game")
+        self.seed = random.getrandbits(64)
+        self._touched = {}
+        self._cache = OrderedDict()
+        self._generation += 1
+        self._make_layers()
+        self.game_over = False
+        self.won = False
+        self._journal = None
+        self._snapshot_depth = 0
+        self.version += 1
+        self._sync_counters()
+        self.solver = SolverFactory.create_solver(self.solver_type, self)
+        self.nb_explosions = 0
+        self.move_log = MoveLog.for_game(self)
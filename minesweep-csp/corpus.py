@@ -0,0 +1,325 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
+
+from backend import MinesweeperBackend
+
+FORMAT = "minesweeper-corpus"
+VERSION = 1
+INDEX_SUFFIX = ".json"
+DATA_SUFFIX = ".bin"
+# Boards generated per task sent to the worker processes
+CHUNK_BOARDS = 64
+DEFAULT_SIZES = [(9, 9), (16, 16), (30, 16)]
+DEFAULT_DENSITIES = [10, 15, 20]
+
+_SEED = struct.Struct("<Q")
+
+
+def _nibble_byte(nibble):
+    # Nibble 15 is a mine, stored as the signed byte -1
+    return 0xFF if nibble == 0xF else nibble
+
+
+# byte -> value of its high / low nibble as a signed byte, for bytes.translate
+_HIGH = bytes(_nibble_byte(value >> 4) for value in range(256))
+_LOW = bytes(_nibble_byte(value & 0xF) for value in range(256))
+_TO_NIBBLE = bytes(value & 0xF for value in range(256))
+_TO_HIGH_NIBBLE = bytes((value & 0xF) << 4 for value in range(256))
+
+
+def mines_for(width, height, density):
+    """Mine count of a board with ``density`` percent of mines."""
+    return int(width * height * density / 100)
+
+
+def board_seed(corpus_seed, width, height, num_mines, index):
+    """Seed of board ``index`` of a group, derived from the corpus seed."""
+    digest = hashlib.blake2b(
+        f"{corpus_seed}:{width}x{height}:{num_mines}:{index}".encode(),
+        digest_size=8,
+        person=b"mscorpus",
+    ).digest()
+    return int.from_bytes(digest, "little")
+
+
+def pack_grid(grid):
+    """
+    Pack cell values into 4 bits per cell, two cells per byte.
+
+    Args:
+        grid (list): Rows of cell values, -1 for a mine
+
+    Returns:
+        bytes: ``ceil(cells / 2)`` bytes, the first cell in the high nibble
+    """
+    cells = array("b", chain.from_iterable(grid)).tobytes()
+    if len(cells) % 2:
+        cells += b"\0"
+    high = cells[0::2].translate(_TO_HIGH_NIBBLE)
+    low = cells[1::2].translate(_TO_NIBBLE)
+    return (int.from_bytes(high, "big") | int.from_bytes(low, "big")).to_bytes(
+        len(high), "big"
+    )
+
+
+def unpack_grid(data, width, height):
+    """
+    Rows of cell values from ``pack_grid`` bytes.
+
+    Every step is a bytes operation done in C (two ``translate`` calls, a
+    strided slice assignment and an array conversion), so a board loads
+    without a Python loop per cell.
+    """
+    cells = bytearray(2 * len(data))
+    cells[0::2] = data.translate(_HIGH)
+    cells[1::2] = data.translate(_LOW)
+    values = array("b", cells[: width * height]).tolist()
+    return [values[start : start + width] for start in range(0, width * height, width)]
+
+
+def _generate_chunk(width, height, num_mines, seeds):
+    """Packed boards for ``seeds``, laid out exactly as the backend does."""
+    return b"".join(
+        pack_grid(MinesweeperBackend(width, height, num_mines, seed=seed).grid)
+        for seed in seeds
+    )
+
+
+def generate(path, groups, count, seed=0, workers=None):
+    """
+    Write a corpus of ``count`` boards for every ``(width, height, num_mines)``.
+
+    The data file holds, per group, the seeds of its boards (little-endian
+    uint64) followed by the packed boards, all of the same size. The index
+    (a small JSON file) gives the offsets of every group. Boards are
+    generated in parallel and written in a fixed order, so the corpus only
+    depends on ``seed``.
+
+    Args:
+        path (str): Path of the corpus, without extension
+        groups (list): ``(width, height, num_mines)`` tuples
+        count (int): Boards per group
+        seed (int): Seed of the corpus
+        workers (int): Worker processes, one per CPU by default
+
+    Returns:
+        dict: The index written next to the data
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    index = {"format": FORMAT, "version": VERSION, "seed": seed, "groups": []}
+    offset = 0
+    with open(path + DATA_SUFFIX, "wb") as f, ProcessPoolExecutor(
+        max_workers=workers
+    ) as executor:
+        for width, height, num_mines in groups:
+            seeds = [
+                board_seed(seed, width, height, num_mines, i) for i in range(count)
+            ]
+            futures = [
+                executor.submit(
+                    _generate_chunk,
+                    width,
+                    height,
+                    num_mines,
+                    seeds[start : start + CHUNK_BOARDS],
+                )
+                for start in range(0, count, CHUNK_BOARDS)
+            ]
+            board_bytes = (width * height + 1) // 2
+            group = {
+                "width": width,
+                "height": height,
+                "num_mines": num_mines,
+                "count": count,
+                "seeds_offset": offset,
+                "boards_offset": offset + count * _SEED.size,
+                "board_bytes": board_bytes,
+            }
+            f.write(b"".join(_SEED.pack(board) for board in seeds))
+            for future in futures:
+                f.write(future.result())
+            offset = group["boards_offset"] + count * board_bytes
+            index["groups"].append(group)
+    with open(path + INDEX_SUFFIX, "w") as f:
+        json.dump(index, f, indent=2)
+    return index
+
+
+class BoardCorpus:
+    """
+    Read-only view of a corpus written by ``generate``.
+
+    The data file is memory-mapped, so opening a corpus only reads its
+    index, and a board costs one slice and an unpack. Every process that
+    opens the same corpus shares the pages through the OS cache.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Path of the corpus, without extension
+
+        Raises:
+            ValueError: If the index is not a corpus index of this version
+        """
+        with open(path + INDEX_SUFFIX) as f:
+            index = json.load(f)
+        if index.get("format") != FORMAT or index.get("version") != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} board corpus")
+        self.path = path
+        self.seed = index["seed"]
+        self.groups = {
+            (group["width"], group["height"], group["num_mines"]): group
+            for group in index["groups"]
+        }
+        self._file = open(path + DATA_SUFFIX, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._by_seed = None
+
+    def __len__(self):
+        return sum(group["count"] for group in self.groups.values())
+
+    def count(self, width, height, num_mines):
+        """Number of boards of a group, 0 if the corpus has none."""
+        group = self.groups.get((width, height, num_mines))
+        return group["count"] if group else 0
+
+    def _group(self, width, height, num_mines, index):
+        group = self.groups.get((width, height, num_mines))
+        if group is None:
+            raise KeyError(f"No {width}x{height} boards with {num_mines} mines")
+        if not 0 <= index < group["count"]:
+            raise IndexError(f"Board {index} out of range ({group['count']})")
+        return group
+
+    def board_seed(self, width, height, num_mines, index):
+        """Seed the board was generated from."""
+        group = self._group(width, height, num_mines, index)
+        offset = group["seeds_offset"] + index * _SEED.size
+        return _SEED.unpack_from(self._data, offset)[0]
+
+    def grid(self, width, height, num_mines, index):
+        """Cell values of a board, as rows like ``MinesweeperBackend.grid``."""
+        group = self._group(width, height, num_mines, index)
+        size = group["board_bytes"]
+        start = group["boards_offset"] + index * size
+        return unpack_grid(self._data[start : start + size], width, height)
+
+    def board(self, width, height, num_mines, index, solver_type="greedy"):
+        """
+        Game on board ``index`` of a group.
+
+        The game carries the board's seed, so its move log replays on the
+        same board with or without the corpus.
+
+        Returns:
+            MinesweeperBackend
+
+        Raises:
+            KeyError: If the corpus has no such group
+            IndexError: If ``index`` is out of range
+        """
+        return MinesweeperBackend(
+            width,
+            height,
+            num_mines,
+            solver_type,
+            seed=self.board_seed(width, height, num_mines, index),
+            grid=self.grid(width, height, num_mines, index),
+        )
+
+    def find(self, width, height, num_mines, seed):
+        """Index of the board generated from ``seed``, or None."""
+        if self._by_seed is None:
+            self._by_seed = {}
+            for key, group in self.groups.items():
+                for i in range(group["count"]):
+                    offset = group["seeds_offset"] + i * _SEED.size
+                    board = _SEED.unpack_from(self._data, offset)[0]
+                    self._by_seed[(key, board)] = i
+        return self._by_seed.get(((width, height, num_mines), seed))
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+@lru_cache(maxsize=4)
+def open_corpus(path):
+    """Corpus at ``path``, opened once per process."""
+    return BoardCorpus(path)
+
+
+def _parse_size(value):
+    width, _, height = value.lower().partition("x")
+    return int(width), int(height or width)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate or inspect a pre-generated board corpus."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("generate", help="Write a new corpus")
+    build.add_argument("path", help="Path of the corpus, without extension")
+    build.add_argument(
+        "--sizes",
+        nargs="+",
+        type=_parse_size,
+        default=DEFAULT_SIZES,
+        help="Board sizes as WIDTHxHEIGHT (default: 9x9 16x16 30x16)",
+    )
+    build.add_argument(
+        "--densities",
+        nargs="+",
+        type=int,
+        default=DEFAULT_DENSITIES,
+        help="Mine densities in percent",
+    )
+    build.add_argument("--count", type=int, default=1000, help="Boards per group")
+    build.add_argument("--seed", type=int, default=0)
+    build.add_argument("--workers", type=int, help="Worker processes")
+
+    info = sub.add_parser("info", help="Describe a corpus")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        groups = [
+            (width, height, mines_for(width, height, density))
+            for width, height in args.sizes
+            for density in args.densities
+        ]
+        generate(args.path, groups, args.count, seed=args.seed, workers=args.workers)
+        size = os.path.getsize(args.path + DATA_SUFFIX)
+        print(f"{len(groups) * args.count} boards written to {args.path} ({size} B)")
+        return 0
+
+    with BoardCorpus(args.path) as corpus:
+        print(f"{args.path}: {len(corpus)} boards, seed {corpus.seed}")
+        for (width, height, num_mines), group in corpus.groups.items():
+            size = f"{width}x{height}"
+            print(f"  {size:>9} {num_mines:>6} mines {group['count']:>8} boards")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
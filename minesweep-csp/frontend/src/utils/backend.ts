@@ -11,15 +11,60 @@ export interface GameStartResponse {
 export interface SolveNextMoveResponse {
   x?: number;
   y?: number;
+  tier?:
+    | "trivial"
+    | "subset"
+    | "enumeration"
+    | "sampling"
+    | "endgame"
+    | "guess";
+  budget_ms?: number | null;
+  elapsed_ms?: number;
+  budget_used?: number | null;
   error?: string;
 }
 
+export interface ProbabilitiesResponse {
+  version: number;
+  width: number;
+  height: number;
+  // A byte per cell, row by row: round(p * scale), or `known` for revealed
+  // and flagged cells
+  data: string;
+  scale: number;
+  known: number;
+  interior: number | null;
+  exact: boolean;
+  engine: "frontier" | "endgame";
+  reused_components: number;
+  // The budget ran out before the analysis finished
+  truncated: boolean;
+  cached: boolean;
+}
+
+/** Decode the probability bytes; null marks revealed and flagged cells. */
+export function decodeProbabilities(
+  response: ProbabilitiesResponse
+): (number | null)[][] {
+  const bytes = atob(response.data);
+  const rows: (number | null)[][] = [];
+  for (let y = 0; y < response.height; y++) {
+    const row: (number | null)[] = [];
+    for (let x = 0; x < response.width; x++) {
+      const value = bytes.charCodeAt(y * response.width + x);
+      row.push(value === response.known ? null : value / response.scale);
+    }
+    rows.push(row);
+  }
+  return rows;
+}
+
 export const MinesweeperAPI = {
   async startNewGame(
     cols: number,
     rows: number,
     mines: number,
-    solverType: string = "basic"
+    solverType: string = "greedy"
   ): Promise<GameStartResponse> {
     try {
       const response = await fetch(`${API_URL}/game/new`, {
@@ -174,6 +219,34 @@ export const MinesweeperAPI = {
     }
   },
 
+  async getProbabilities(gameId: string): Promise<ProbabilitiesResponse> {
+    try {
+      const response = await fetch(
+        `${API_URL}/game/${gameId}/probabilities`,
+        {
+          headers: {
+            Accept: "application/json",
+          },
+          credentials: "include",
+        }
+      );
+
+      if (!response.ok) {
+        console.error(
+          `HTTP error! status: ${response.status} ${response.statusText}`
+        );
+        throw new Error(
+          `HTTP error! status: ${response.status} ${response.statusText}`
+        );
+      }
+
+      return await response.json();
+    } catch (error) {
+      console.error("Error fetching probabilities:", error);
+      throw error;
+    }
+  },
+
   async getAvailableSolvers(): Promise<{ solvers: Solver[] }> {
     try {
       const response = await fetch(`${API_URL}/solvers`, {
@@ -16,6 +16,8 @@ export interface Solver {
   id: string;
   name: string;
   description: string;
+  capabilities?: ("mine_probabilities" | "time_budget" | "batch_moves")[];
+  loaded?: boolean;
 }
 
 export interface Move {
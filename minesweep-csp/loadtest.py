@@ -0,0 +1,369 @@
+import argparse
+import contextlib
+import functools
+import http.client
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+DEFAULT_BOARDS = ["9x9:10", "16x16:40", "30x16:99"]
+DEFAULT_SOLVERS = ["astar", "astar_boost"]
+PERCENTILES = (50, 95, 99)
+
+
+class InProcessTransport:
+    """Calls the Flask app directly through its test client."""
+
+    def __init__(self):
+        from app import app
+
+        self.client = app.test_client()
+
+    def request(self, method, path, payload=None):
+        response = self.client.open(path, method=method, json=payload)
+        return response.status_code, response.get_json(silent=True)
+
+    def close(self):
+        pass
+
+
+class HttpTransport:
+    """Keep-alive HTTP connection to a running server."""
+
+    def __init__(self, base_url):
+        url = urlsplit(base_url)
+        self.prefix = url.path.rstrip("/")
+        self.connection = http.client.HTTPConnection(
+            url.hostname, url.port or 80, timeout=60
+        )
+
+    def request(self, method, path, payload=None):
+        body = None if payload is None else json.dumps(payload)
+        headers = {"Content-Type": "application/json"} if body else {}
+        try:
+            self.connection.request(method, self.prefix + path, body, headers)
+            response = self.connection.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            # Reconnect on the next request
+            self.connection.close()
+            raise
+        try:
+            return response.status, json.loads(data)
+        except ValueError:
+            return response.status, None
+
+    def close(self):
+        self.connection.close()
+
+
+class Recorder:
+    """Latencies and status codes per endpoint, shared by every client."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    def add(self, endpoint, seconds, status):
+        with self._lock:
+            self.latencies[endpoint].append(seconds)
+            self.statuses[endpoint][status] += 1
+
+
+def _call(transport, recorder, endpoint, method, path, payload=None):
+    """Send one request and record it under ``endpoint``."""
+    start = time.perf_counter()
+    try:
+        status, body = transport.request(method, path, payload)
+    except (OSError, http.client.HTTPException):
+        status, body = "error", None
+    recorder.add(endpoint, time.perf_counter() - start, status)
+    return status, body
+
+
+def run_session(transport, recorder, board, solver, reveals, max_moves, rng):
+    """
+    Play one game with the same calls as the frontend.
+
+    The client creates a game, reveals a few random hidden cells, then
+    alternates ``solve/next`` and ``solve/apply`` until the game ends, no
+    move is left or ``max_moves`` is reached, and finally deletes the game.
+
+    Args:
+        transport: ``InProcessTransport`` or ``HttpTransport``
+        recorder (Recorder): Where latencies are stored
+        board (tuple): ``(width, height, num_mines)``
+        solver (str): Solver of the game
+        reveals (int): Random reveals before the solver takes over
+        max_moves (int): Upper bound on solver moves
+        rng (random.Random): Source of the random reveals
+    """
+    width, height, num_mines = board
+    status, body = _call(
+        transport,
+        recorder,
+        "POST /api/game/new",
+        "POST",
+        "/api/game/new",
+        {
+            "width": width,
+            "height": height,
+            "num_mines": num_mines,
+            "solver_type": solver,
+        },
+    )
+    if status != 200:
+        return
+    game = f"/api/game/{body['game_id']}"
+    state = body["state"]
+
+    for _ in range(reveals):
+        if state["game_over"]:
+            break
+        hidden = [
+            (x, y)
+            for y in range(height)
+            for x in range(width)
+            if not state["revealed"][y][x]
+        ]
+        x, y = rng.choice(hidden)
+        status, body = _call(
+            transport,
+            recorder,
+            "POST /api/game/<id>/reveal",
+            "POST",
+            f"{game}/reveal",
+            {"x": x, "y": y},
+        )
+        if status != 200:
+            break
+        state = body["state"]
+
+    for _ in range(max_moves):
+        if state["game_over"]:
+            break
+        status, _ = _call(
+            transport,
+            recorder,
+            "GET /api/game/<id>/solve/next",
+            "GET",
+            f"{game}/solve/next",
+        )
+        if status != 200:
+            break
+        status, body = _call(
+            transport,
+            recorder,
+            "POST /api/game/<id>/solve/apply",
+            "POST",
+            f"{game}/solve/apply",
+        )
+        if status != 200 or not body["move_applied"]:
+            break
+        state = body["state"]
+
+    _call(transport, recorder, "DELETE /api/game/<id>", "DELETE", game)
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of a sorted list."""
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * p // 100))
+    return values[int(rank) - 1]
+
+
+def summarize(recorder, elapsed):
+    """
+    Throughput and latency percentiles per endpoint.
+
+    Args:
+        recorder (Recorder): Collected latencies
+        elapsed (float): Wall time of the run in seconds
+
+    Returns:
+        dict: Per endpoint: requests, requests per second, failures
+            (transport errors and 5xx), status counts, mean and percentile
+            latencies in milliseconds
+    """
+    report = {}
+    for endpoint, latencies in sorted(recorder.latencies.items()):
+        latencies = sorted(latencies)
+        statuses = recorder.statuses[endpoint]
+        failures = sum(
+            count
+            for status, count in statuses.items()
+            if status == "error" or status >= 500
+        )
+        stats = {
+            "requests": len(latencies),
+            "throughput": len(latencies) / elapsed if elapsed else 0.0,
+            "failures": failures,
+            "statuses": {str(status): count for status, count in statuses.items()},
+            "mean_ms": sum(latencies) / len(latencies) * 1000,
+        }
+        for p in PERCENTILES:
+            stats[f"p{p}_ms"] = percentile(latencies, p) * 1000
+        stats["max_ms"] = latencies[-1] * 1000
+        report[endpoint] = stats
+    return report
+
+
+def run(
+    transport_factory,
+    sessions,
+    concurrency,
+    boards,
+    solvers,
+    reveals=3,
+    max_moves=1000,
+    seed=0,
+):
+    """
+    Drive the API with ``concurrency`` clients until ``sessions`` games
+    have been played.
+
+    Args:
+        transport_factory (callable): Builds one transport per client
+        sessions (int): Games to play in total
+        concurrency (int): Simultaneous clients
+        boards (list): ``(width, height, num_mines)`` tuples, picked at
+            random for every game
+        solvers (list): Solver types, picked at random for every game
+        reveals (int): Random reveals before the solver takes over
+        max_moves (int): Upper bound on solver moves per game
+        seed (int): Seed of the board mix and of the random reveals
+
+    Returns:
+        dict: Wall time, total throughput and per-endpoint ``summarize``
+    """
+    rng = random.Random(seed)
+    work = queue.SimpleQueue()
+    for index in range(sessions):
+        work.put((index, rng.choice(boards), rng.choice(solvers)))
+    recorder = Recorder()
+
+    def client():
+        transport = transport_factory()
+        try:
+            while True:
+                try:
+                    index, board, solver = work.get_nowait()
+                except queue.Empty:
+                    return
+                run_session(
+                    transport,
+                    recorder,
+                    board,
+                    solver,
+                    reveals,
+                    max_moves,
+                    random.Random(f"{seed}:{index}"),
+                )
+        finally:
+            transport.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(client) for _ in range(concurrency)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    endpoints = summarize(recorder, elapsed)
+    total = sum(stats["requests"] for stats in endpoints.values())
+    return {
+        "sessions": sessions,
+        "concurrency": concurrency,
+        "elapsed": elapsed,
+        "requests": total,
+        "throughput": total / elapsed if elapsed else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+def _parse_board(value):
+    size, _, mines = value.lower().partition(":")
+    width, _, height = size.partition("x")
+    return int(width), int(height or width), int(mines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Load-test the Minesweeper API with concurrent clients."
+    )
+    parser.add_argument(
+        "--url",
+        help="Base URL of a running server, e.g. http://127.0.0.1:5000 "
+        "(default: call the app in-process)",
+    )
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--boards",
+        nargs="+",
+        type=_parse_board,
+        default=[_parse_board(board) for board in DEFAULT_BOARDS],
+        help="Board mix as WIDTHxHEIGHT:MINES (default: 9x9:10 16x16:40 30x16:99)",
+    )
+    parser.add_argument("--solvers", nargs="+", default=DEFAULT_SOLVERS)
+    parser.add_argument("--reveals", type=int, default=3)
+    parser.add_argument("--max-moves", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args(argv)
+
+    print(
+        f"Running {args.sessions} sessions with {args.concurrency} clients "
+        f"against {args.url or 'the in-process app'}..."
+    )
+    with contextlib.ExitStack() as stack:
+        if args.url:
+            factory = functools.partial(HttpTransport, args.url)
+        else:
+            factory = InProcessTransport
+            # The backend prints on every solver move
+            devnull = stack.enter_context(open(os.devnull, "w"))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+        report = run(
+            factory,
+            args.sessions,
+            args.concurrency,
+            args.boards,
+            args.solvers,
+            reveals=args.reveals,
+            max_moves=args.max_moves,
+            seed=args.seed,
+        )
+
+    print(
+        f"\n{report['requests']} requests in {report['elapsed']:.2f} s"
+        f" ({report['throughput']:.1f} req/s)\n"
+    )
+    header = "  ".join(f"{f'p{p}':>9}" for p in PERCENTILES)
+    print(f"  {'endpoint':<34} {'req':>6} {'req/s':>8} {'fail':>5}  {header}")
+    for endpoint, stats in report["endpoints"].items():
+        latencies = "  ".join(f"{stats[f'p{p}_ms']:9.2f}" for p in PERCENTILES)
+        print(
+            f"  {endpoint:<34} {stats['requests']:>6} {stats['throughput']:8.1f}"
+            f" {stats['failures']:>5}  {latencies}"
+        )
+    print("  (latencies in ms)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.json}")
+    failed = any(stats["failures"] for stats in report["endpoints"].values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+import bisect
+import threading
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds (seconds) of the request latency buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+# Solver steps range from microseconds (trivial moves) to the move budget
+SOLVER_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+
+
+def _format_labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter, one value per combination of label values."""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for label_values, value in sorted(values.items()):
+            yield self.name, _format_labels(self.labels, label_values), value
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed buckets.
+
+    Observing a value is a binary search and a few additions under a lock,
+    so it can stay enabled on every request.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [
+                    [0] * (len(self.buckets) + 1),
+                    0.0,
+                    0,
+                ]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        with self._lock:
+            series = {
+                key: (list(counts), total, count)
+                for key, (counts, total, count) in self._series.items()
+            }
+        for label_values, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket
+                le = f'le="{_format_value(bound)}"'
+                labels = _format_labels(self.labels, label_values, le)
+                yield f"{self.name}_bucket", labels, cumulative
+            labels = _format_labels(self.labels, label_values)
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class Gauge:
+    """Value computed when the metrics are scraped."""
+
+    def __init__(self, name, documentation, collect, labels=(), kind="gauge"):
+        """
+        Args:
+            name (str): Metric name
+            documentation (str): HELP text
+            collect (callable): Returns ``{label values: value}``, or a
+                single number when the gauge has no labels
+            labels (tuple): Label names
+            kind (str): Prometheus type, "counter" for values read from a
+                counter kept elsewhere
+        """
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.collect = collect
+
+    def samples(self):
+        values = self.collect()
+        if not isinstance(values, dict):
+            values = {(): values}
+        for label_values, value in sorted(values.items()):
+            yield self.name, _format_labels(self.labels, label_values), value
+
+
+class Registry:
+    """Set of metrics rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        self.metrics = []
+        self.caches = {}
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def register_cache(self, name, cache_info):
+        """
+        Expose the hits and misses of a cache.
+
+        Args:
+            name (str): Value of the ``cache`` label
+            cache_info (callable): Returns an object with ``hits`` and
+                ``misses`` attributes, like ``functools.lru_cache``'s
+                ``cache_info``, or None while the cache does not exist yet
+        """
+        self.caches[name] = cache_info
+
+    def _cache_metrics(self):
+        infos = {name: info() for name, info in self.caches.items()}
+        infos = {name: info for name, info in infos.items() if info is not None}
+        hits = Gauge(
+            "minesweeper_cache_hits_total",
+            "Cache lookups answered from the cache.",
+            lambda: {(name,): info.hits for name, info in infos.items()},
+            ("cache",),
+            kind="counter",
+        )
+        misses = Gauge(
+            "minesweeper_cache_misses_total",
+            "Cache lookups that had to compute the value.",
+            lambda: {(name,): info.misses for name, info in infos.items()},
+            ("cache",),
+            kind="counter",
+        )
+        ratio = Gauge(
+            "minesweeper_cache_hit_ratio",
+            "Share of cache lookups answered from the cache.",
+            lambda: {
+                (name,): info.hits / (info.hits + info.misses)
+                for name, info in infos.items()
+                if info.hits + info.misses
+            },
+            ("cache",),
+        )
+        return [hits, misses, ratio]
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        metrics = self.metrics + (self._cache_metrics() if self.caches else [])
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,358 @@
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from backend import MinesweeperBackend
+from solvers.astarsolver import AstarSolver
+from solvers.astarboostedsolver import AstarBoostedSolver
+from solvers.astarbitboardsolver import AstarBitboardSolver
+
+DEFAULT_SIZES = [(9, 9), (16, 16), (30, 16), (100, 100), (1000, 1000)]
+DEFAULT_DENSITIES = [10, 15, 20]
+DEFAULT_BASELINE = os.path.join("benchmarks", "micro_baseline.json")
+DEFAULT_THRESHOLD = 0.25
+# Shortest timed sample; faster operations are timed over a loop of calls
+SAMPLE_TIME = 0.01
+# Boards and random states used to check the bitboard sweep against AstarSolver
+CHECK_SIZES = [(9, 9), (16, 16), (30, 16)]
+CHECK_STATES = 300
+
+
+def _case_seed(width, height, density):
+    """Fixed seed for a (size, density) case, stable across runs and machines."""
+    return width * 1_000_003 + height * 1_009 + density
+
+
+def _build_game(width, height, density):
+    """Build a seeded game whose board only depends on the case parameters."""
+    random.seed(_case_seed(width, height, density))
+    num_mines = int(width * height * density / 100)
+    game = MinesweeperBackend(width, height, num_mines, "astar")
+    # Only time the operations themselves, not appending to the move log
+    game.move_log = None
+    return game
+
+
+def _reset_state(game):
+    """Hide and unflag every cell without touching the mine layout."""
+    game.revealed = [[False] * game.width for _ in range(game.height)]
+    game.flagged = [[False] * game.width for _ in range(game.height)]
+    game.game_over = False
+    game.won = False
+    game.nb_explosions = 0
+    game._sync_counters()
+
+
+def _largest_opening(game):
+    """Return the zero cell whose flood fill is the largest on the board."""
+    best, best_size = None, -1
+    seen = [[False] * game.width for _ in range(game.height)]
+    for y in range(game.height):
+        for x in range(game.width):
+            if game.grid[y][x] != 0 or seen[y][x]:
+                continue
+            size = 0
+            stack = [(x, y)]
+            seen[y][x] = True
+            while stack:
+                cx, cy = stack.pop()
+                size += 1
+                for ny in range(max(0, cy - 1), min(game.height, cy + 2)):
+                    for nx in range(max(0, cx - 1), min(game.width, cx + 2)):
+                        if game.grid[ny][nx] == 0 and not seen[ny][nx]:
+                            seen[ny][nx] = True
+                            stack.append((nx, ny))
+            if size > best_size:
+                best, best_size = (x, y), size
+    if best is None:
+        # Fall back to any safe cell on boards without openings
+        best = next(
+            (x, y)
+            for y in range(game.height)
+            for x in range(game.width)
+            if game.grid[y][x] != -1
+        )
+    return best
+
+
+def _mid_game(game, opening):
+    """Put the game in the state reached after clicking the largest opening."""
+    _reset_state(game)
+    game.reveal(*opening)
+
+
+def _late_game(game):
+    """Reveal every safe cell and flag all mines but the last one.
+
+    ``_check_win`` only compares the hidden-safe and unflagged-mine counters,
+    so its timing should stay flat across board sizes; this state is the
+    closest to a win, where a scan would have had to cover the whole board.
+    """
+    _reset_state(game)
+    last_mine = None
+    for y in range(game.height):
+        for x in range(game.width):
+            if game.grid[y][x] == -1:
+                game.flagged[y][x] = True
+                last_mine = (x, y)
+            else:
+                game.revealed[y][x] = True
+    if last_mine is not None:
+        game.flagged[last_mine[1]][last_mine[0]] = False
+    game._sync_counters()
+
+
+def _calls_per_sample(func, sample_time):
+    """
+    Number of calls of ``func`` that take at least ``sample_time`` seconds.
+
+    Tries 1, 2, 5, 10, 20, 50... calls like ``timeit.Timer.autorange``, so
+    sub-microsecond operations are timed over a loop rather than one call.
+    """
+    number = 1
+    while True:
+        for factor in (1, 2, 5):
+            calls = number * factor
+            start = time.perf_counter()
+            for _ in range(calls):
+                func()
+            if time.perf_counter() - start >= sample_time:
+                return calls
+        number *= 10
+
+
+def _measure(func, setup=None, min_time=0.2, max_repeats=50):
+    """
+    Time ``func`` and return the best of several samples.
+
+    Without ``setup``, each sample times a loop of calls lasting at least
+    ``SAMPLE_TIME``, so fast operations are not lost in timer noise. With
+    ``setup``, the state has to be rebuilt before every call, so each
+    sample is a single call.
+
+    Args:
+        func (callable): Operation to time
+        setup (callable): Called before every run, outside of the timed region
+        min_time (float): Keep repeating until this much time was measured
+        max_repeats (int): Upper bound on the number of samples
+
+    Returns:
+        float: Fastest observed time per call, in seconds
+    """
+    calls = 1 if setup is not None else _calls_per_sample(func, SAMPLE_TIME)
+    best = float("inf")
+    total = 0.0
+    repeats = 0
+    while repeats < max_repeats and (repeats < 3 or total < min_time):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed / calls)
+        total += elapsed
+        repeats += 1
+        # A single run of a huge board is already a stable measurement
+        if elapsed > min_time:
+            break
+    return best
+
+
+def run_case(width, height, density, min_time=0.2):
+    """
+    Run every micro-benchmark for one board size and mine density.
+
+    Args:
+        width (int): Width of the board
+        height (int): Height of the board
+        density (int): Mine density in percent
+        min_time (float): Minimal measured time per operation
+
+    Returns:
+        dict: Mapping of benchmark name to best time in seconds
+    """
+    game = _build_game(width, height, density)
+    opening = _largest_opening(game)
+    prefix = f"{width}x{height}@{density}%"
+    results = {}
+
+    results[f"{prefix}/_calculate_numbers"] = _measure(
+        game._calculate_numbers, min_time=min_time
+    )
+
+    results[f"{prefix}/reveal"] = _measure(
+        lambda: game.reveal(*opening),
+        setup=lambda: _reset_state(game),
+        min_time=min_time,
+    )
+
+    _late_game(game)
+    results[f"{prefix}/_check_win"] = _measure(game._check_win, min_time=min_time)
+
+    _mid_game(game, opening)
+    hidden = [
+        (x, y)
+        for y in range(game.height)
+        for x in range(game.width)
+        if not game.revealed[y][x]
+    ]
+    probes = random.Random(_case_seed(width, height, density)).sample(
+        hidden, min(100, len(hidden))
+    )
+
+    def hypothetical_reveals():
+        for x, y in probes:
+            token = game.snapshot()
+            game.reveal(x, y)
+            game.restore(token)
+
+    results[f"{prefix}/hypothetical_reveal_x100"] = _measure(
+        hypothetical_reveals, min_time=min_time
+    )
+    results[f"{prefix}/clone"] = _measure(game.clone, min_time=min_time)
+
+    astar = AstarSolver(game)
+    results[f"{prefix}/find_trivial_moves"] = _measure(
+        astar.find_trivial_moves, min_time=min_time
+    )
+
+    bitboard = AstarBitboardSolver(game)
+    results[f"{prefix}/find_trivial_moves[bitboard]"] = _measure(
+        bitboard.find_trivial_moves, min_time=min_time
+    )
+
+    boosted = AstarBoostedSolver(game)
+
+    def frontier():
+        random.seed(_case_seed(width, height, density))
+        boosted.probabilistic_frontier_solver()
+
+    results[f"{prefix}/probabilistic_frontier_solver"] = _measure(
+        frontier, min_time=min_time
+    )
+    return results
+
+
+def run_suite(sizes, densities, min_time=0.2):
+    """Run the micro-benchmarks over every (size, density) combination."""
+    results = {}
+    for width, height in sizes:
+        for density in densities:
+            case = run_case(width, height, density, min_time=min_time)
+            for name, seconds in case.items():
+                print(f"  {name:<55} {seconds * 1000:12.3f} ms")
+            results.update(case)
+    return results
+
+
+def save_baseline(results, path):
+    """Write timings and the machine they were measured on to a JSON file."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    payload = {
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare timings against a baseline.
+
+    Args:
+        results (dict): Current timings
+        baseline (dict): Baseline timings
+        threshold (float): Allowed relative slowdown (0.25 means 25%)
+
+    Returns:
+        list: ``(name, baseline, current, ratio)`` for every regression
+    """
+    regressions = []
+    for name, current in sorted(results.items()):
+        reference = baseline.get(name)
+        if not reference:
+            print(f"  {name:<55} {'new':>12}")
+            continue
+        ratio = current / reference
+        marker = "REGRESSION" if ratio > 1 + threshold else ""
+        print(f"  {name:<55} {ratio:11.2f}x {marker}")
+        if marker:
+            regressions.append((name, reference, current, ratio))
+    return regressions
+
+
+def _parse_size(value):
+    width, _, height = value.lower().partition("x")
+    return int(width), int(height or width)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmarks for the Minesweeper backend and solvers."
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=_parse_size,
+        default=DEFAULT_SIZES,
+        help="Board sizes as WIDTHxHEIGHT (default: 9x9 up to 1000x1000)",
+    )
+    parser.add_argument(
+        "--densities",
+        nargs="+",
+        type=int,
+        default=DEFAULT_DENSITIES,
+        help="Mine densities in percent",
+    )
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Fail when an operation is slower than baseline by this ratio",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store the current timings as the new baseline",
+    )
+    parser.add_argument("--min-time", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    print("Running micro-benchmarks...")
+    results = run_suite(args.sizes, args.densities, min_time=args.min_time)
+
+    if args.save_baseline or not os.path.exists(args.baseline):
+        save_baseline(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+
+    print(f"\nComparison against {args.baseline}:")
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+        for name, reference, current, ratio in regressions:
+            print(
+                f"  {name}: {reference * 1000:.3f} ms -> {current * 1000:.3f} ms"
+                f" ({ratio:.2f}x)"
+            )
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
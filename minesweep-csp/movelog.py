@@ -0,0 +1,229 @@
+import struct
+from collections import namedtuple
+
+from solvers.basesolver import TIERS
+
+MAGIC = b"MSWL"
+VERSION = 2
+
+# Board kinds stored in the header
+KIND_DENSE = 0
+KIND_CHUNKED = 1
+
+# Actions, stored in the low two bits of a record's flag byte
+REVEAL = 0
+FLAG = 1
+ACTION_NAMES = ("reveal", "flag")
+
+_SOLVER_BIT = 1 << 2  # Move made by the solver
+_STEP_BIT = 1 << 3  # First record of a solver move
+_TIER_SHIFT = 4  # Tier index + 1 in the high bits, 0 when unknown
+
+# magic, version, kind, seed, width, height, num_mines, density, tile size,
+# length of the solver name (followed by the name itself). Chunked boards
+# store 0 mines: their count follows from the density and may not fit
+_HEADER = struct.Struct("<4sBBQQQQdHB")
+# Version 1 stored the sizes as uint32
+_HEADERS = {1: struct.Struct("<4sBBQIIIdHB"), VERSION: _HEADER}
+# flags, x, y, solver step time in microseconds
+_RECORD = struct.Struct("<BIII")
+# Same with uint64 coordinates, for boards wider or taller than 2**32 cells
+_WIDE_RECORD = struct.Struct("<BQQI")
+_MAX_MICROSECONDS = 2**32 - 1
+_MAX_NARROW = 2**32
+_MAX_WIDE = 2**64
+
+Move = namedtuple("Move", "action x y solver step tier elapsed")
+Move.__doc__ = """One logged action.
+
+``solver`` tells whether the solver made it and ``step`` whether it is the
+first action of a solver move; ``tier`` and ``elapsed`` (seconds) describe
+the solver step, the latter only on the first action of the move.
+"""
+
+
+class MoveLog:
+    """
+    Compact binary record of the actions played in one game.
+
+    The header holds everything needed to rebuild the board (size, mine
+    count, seed, board kind); every action then takes a fixed 13-byte
+    record, so a long game stays a few kilobytes. Chunked boards too large
+    for 32-bit coordinates use 21-byte records with 64-bit ones instead.
+    """
+
+    def __init__(
+        self,
+        width,
+        height,
+        num_mines,
+        seed,
+        solver_type="greedy",
+        kind=KIND_DENSE,
+        density=0.0,
+        tile_size=0,
+    ):
+        """
+        Args:
+            width (int): Width of the board
+            height (int): Height of the board
+            num_mines (int): Number of mines, not stored for chunked boards
+            seed (int): Seed of the mine layout, between 0 and 2**64 - 1
+            solver_type (str): Solver the game was created with
+            kind (int): ``KIND_DENSE`` or ``KIND_CHUNKED``
+            density (float): Mine density of a chunked board
+            tile_size (int): Tile side of a chunked board
+
+        Raises:
+            ValueError: If the seed, the size or the mine count of a dense
+                board do not fit in 64 bits
+        """
+        if not 0 <= seed < 2**64:
+            raise ValueError("Only seeds between 0 and 2**64 - 1 can be logged")
+        if not (0 <= width < _MAX_WIDE and 0 <= height < _MAX_WIDE):
+            raise ValueError("Only sizes between 0 and 2**64 - 1 can be logged")
+        if kind == KIND_DENSE and not 0 <= num_mines < _MAX_WIDE:
+            raise ValueError("Only mine counts between 0 and 2**64 - 1 can be logged")
+        self.width = width
+        self.height = height
+        self.num_mines = num_mines
+        self.seed = seed
+        self.solver_type = solver_type
+        self.kind = kind
+        self.density = density
+        self.tile_size = tile_size
+        wide = width > _MAX_NARROW or height > _MAX_NARROW
+        self._record = _WIDE_RECORD if wide else _RECORD
+        self.records = bytearray()
+
+    @classmethod
+    def for_game(cls, game):
+        """Empty log describing the board of ``game``."""
+        if game.dense:
+            return cls(
+                game.width, game.height, game.num_mines, game.seed, game.solver_type
+            )
+        return cls(
+            game.width,
+            game.height,
+            game.num_mines,
+            game.seed,
+            game.solver_type,
+            kind=KIND_CHUNKED,
+            density=game.density,
+            tile_size=game.tile_size,
+        )
+
+    def append(self, action, x, y, solver=False, step=False, tier=None, elapsed=0.0):
+        """
+        Record one action.
+
+        Args:
+            action (int): ``REVEAL`` or ``FLAG``
+            x (int): X coordinate
+            y (int): Y coordinate
+            solver (bool): The solver made the move
+            step (bool): First action of a solver move
+            tier (str): Tier of the solver step, one of ``TIERS``
+            elapsed (float): Duration of the solver step in seconds
+
+        Raises:
+            ValueError: If the cell is outside the board
+        """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"Cell ({x}, {y}) is outside the logged board")
+        flags = action
+        if solver:
+            flags |= _SOLVER_BIT
+        if step:
+            flags |= _STEP_BIT
+        if tier is not None:
+            flags |= (TIERS.index(tier) + 1) << _TIER_SHIFT
+        micros = min(int(elapsed * 1_000_000), _MAX_MICROSECONDS)
+        self.records += self._record.pack(flags, x, y, micros)
+
+    def __len__(self):
+        return len(self.records) // self._record.size
+
+    def __iter__(self):
+        for flags, x, y, micros in self._record.iter_unpack(self.records):
+            tier = flags >> _TIER_SHIFT
+            yield Move(
+                flags & 0b11,
+                x,
+                y,
+                bool(flags & _SOLVER_BIT),
+                bool(flags & _STEP_BIT),
+                TIERS[tier - 1] if tier else None,
+                micros / 1_000_000,
+            )
+
+    def to_bytes(self):
+        """Serialize the header and the records."""
+        name = self.solver_type.encode()
+        header = _HEADER.pack(
+            MAGIC,
+            VERSION,
+            self.kind,
+            self.seed,
+            self.width,
+            self.height,
+            self.num_mines if self.kind == KIND_DENSE else 0,
+            self.density,
+            self.tile_size,
+            len(name),
+        )
+        return header + name + bytes(self.records)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Parse a log produced by ``to_bytes``.
+
+        Raises:
+            ValueError: If ``data`` is not a move log of a supported version
+        """
+        if len(data) < 5 or data[:4] != MAGIC:
+            raise ValueError("Not a move log")
+        header = _HEADERS.get(data[4])
+        if header is None:
+            raise ValueError(f"Unsupported move log version {data[4]}")
+        if len(data) < header.size:
+            raise ValueError("Truncated move log")
+        (
+            _,
+            version,
+            kind,
+            seed,
+            width,
+            height,
+            num_mines,
+            density,
+            tile_size,
+            name_length,
+        ) = header.unpack_from(data)
+        start = header.size + name_length
+        log = cls(
+            width,
+            height,
+            num_mines,
+            seed,
+            data[header.size : start].decode(),
+            kind=kind,
+            density=density,
+            tile_size=tile_size,
+        )
+        records = data[start:]
+        if len(records) % log._record.size:
+            raise ValueError("Truncated move log")
+        log.records = bytearray(records)
+        return log
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
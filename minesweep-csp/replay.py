@@ -0,0 +1,268 @@
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+
+from backend import MinesweeperBackend
+from chunkedboard import ChunkedMinesweeperBackend
+from corpus import BoardCorpus
+from movelog import ACTION_NAMES, FLAG, KIND_CHUNKED, REVEAL, MoveLog
+from solvers.basesolver import TIER_SUBSET, TIER_TRIVIAL
+
+# Tiers whose moves do not depend on random choices
+DETERMINISTIC_TIERS = (TIER_TRIVIAL, TIER_SUBSET)
+
+
+def build_game(log, solver_type=None, corpus=None):
+    """
+    Rebuild the initial board of a logged game.
+
+    Args:
+        log (MoveLog): Log to rebuild the board from
+        solver_type (str): Solver to attach, defaults to the logged one
+        corpus (BoardCorpus): Corpus to load the board from when it holds
+            the logged seed, instead of generating it again
+
+    Returns:
+        MinesweeperBackend: Fresh game with the same mine layout
+    """
+    solver_type = solver_type or log.solver_type
+    if log.kind == KIND_CHUNKED:
+        return ChunkedMinesweeperBackend(
+            log.width,
+            log.height,
+            log.density,
+            solver_type,
+            seed=log.seed,
+            tile_size=log.tile_size,
+        )
+    if corpus is not None:
+        index = corpus.find(log.width, log.height, log.num_mines, log.seed)
+        if index is not None:
+            return corpus.board(
+                log.width, log.height, log.num_mines, index, solver_type
+            )
+    return MinesweeperBackend(
+        log.width, log.height, log.num_mines, solver_type, seed=log.seed
+    )
+
+
+def seed_step(seed, step):
+    """
+    Seed ``random`` for solver move number ``step`` of a game.
+
+    ``record`` and ``replay`` both call it before every solver move, so the
+    random choices of the solvers (guesses, ties, sampling) are the same in
+    a replay as in the recorded game.
+    """
+    random.seed(f"{seed}:{step}")
+
+
+def _solver_moves(log):
+    """Group the logged actions into player actions and solver moves."""
+    moves = []
+    for move in log:
+        if move.solver and not move.step and moves and moves[-1][0].solver:
+            moves[-1].append(move)
+        else:
+            moves.append([move])
+    return moves
+
+
+def _expected_actions(game):
+    """Actions ``apply_moves`` would make for the solver's current move."""
+    solver = game.solver
+    actions = []
+    # apply_moves skips cells already flagged, including repeated entries
+    for x, y in dict.fromkeys(solver.flagged_cells):
+        if not game.flagged[y][x]:
+            actions.append((FLAG, x, y))
+    if solver.safe_moves:
+        actions.append((REVEAL, *solver.safe_moves[0]))
+    return actions
+
+
+def replay(log, solver_type=None, verify=False, corpus=None):
+    """
+    Re-run a logged game headlessly, as fast as possible.
+
+    Every logged action is applied to a board rebuilt from the seed. With
+    ``verify``, the solver is asked again for each logged solver move and
+    its answer is compared with the log. A different answer is a mismatch
+    for the deterministic tiers; for the others it is reported as a
+    divergence, which is expected for games not played through ``record``
+    since their random choices cannot be reproduced.
+
+    Args:
+        log (MoveLog): Game to replay
+        solver_type (str): Solver used for verification, defaults to the
+            logged one
+        verify (bool): Recompute and compare the solver moves
+        corpus (BoardCorpus): Corpus to load the board from, see
+            ``build_game``
+
+    Returns:
+        dict: Final state, timings and, with ``verify``, the mismatches
+            and divergences
+    """
+    game = build_game(log, solver_type, corpus)
+    game.move_log = None
+    apply_time = defaultdict(float)
+    counts = defaultdict(int)
+    tiers = defaultdict(int)
+    logged_solver_time = 0.0
+    solver_time = 0.0
+    mismatches = []
+    divergences = []
+    step = 0
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for index, group in enumerate(_solver_moves(log)):
+            first = group[0]
+            if first.solver:
+                logged_solver_time += first.elapsed
+                tiers[first.tier] += 1
+                if verify:
+                    seed_step(log.seed, step)
+                    step_start = time.perf_counter()
+                    game.solve_next_move()
+                    solver_time += time.perf_counter() - step_start
+                    logged = [(move.action, move.x, move.y) for move in group]
+                    replayed = _expected_actions(game)
+                    if replayed != logged:
+                        difference = {
+                            "move": index,
+                            "tier": first.tier,
+                            "replayed_tier": game.solver.tier,
+                            "logged": logged,
+                            "replayed": replayed,
+                        }
+                        if first.tier in DETERMINISTIC_TIERS:
+                            mismatches.append(difference)
+                        else:
+                            divergences.append(difference)
+                step += 1
+            for move in group:
+                action_start = time.perf_counter()
+                if move.action == REVEAL:
+                    game.reveal(move.x, move.y)
+                else:
+                    game.toggle_flag(move.x, move.y)
+                apply_time[ACTION_NAMES[move.action]] += (
+                    time.perf_counter() - action_start
+                )
+                counts[ACTION_NAMES[move.action]] += 1
+    elapsed = time.perf_counter() - start
+
+    result = {
+        "actions": len(log),
+        "counts": dict(counts),
+        "elapsed": elapsed,
+        "apply_time": dict(apply_time),
+        "solver_moves": sum(tiers.values()),
+        "tiers": dict(tiers),
+        "logged_solver_time": logged_solver_time,
+        "won": game.won,
+        "game_over": game.game_over,
+        "explosions": game.nb_explosions,
+        "unknown": game.unknown_count(),
+    }
+    if verify:
+        result["solver_time"] = solver_time
+        result["mismatches"] = mismatches
+        result["divergences"] = divergences
+    return result
+
+
+def record(width, height, num_mines, solver_type, seed, max_moves=100_000, grid=None):
+    """
+    Play a game with a solver and return its log.
+
+    ``random`` is reseeded before every move with ``seed_step``, so
+    ``replay(log, verify=True)`` reproduces every solver move exactly.
+
+    Args:
+        width (int): Width of the board
+        height (int): Height of the board
+        num_mines (int): Number of mines
+        solver_type (str): Solver playing the game
+        seed (int): Seed of the mine layout
+        max_moves (int): Stop after this many solver moves
+        grid (list): Cell values of the board of ``seed``, e.g. from a corpus
+
+    Returns:
+        MoveLog
+    """
+    game = MinesweeperBackend(
+        width, height, num_mines, solver_type, seed=seed, grid=grid
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        for step in range(max_moves):
+            seed_step(seed, step)
+            if game.game_over or game.solve_next_move() is None:
+                break
+            game.apply_solver_move()
+    return game.move_log
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Replay Minesweeper move logs headlessly."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    play = sub.add_parser("record", help="Play a solver game and save its log")
+    play.add_argument("output")
+    play.add_argument("--width", type=int, default=30)
+    play.add_argument("--height", type=int, default=16)
+    play.add_argument("--mines", type=int, default=99)
+    play.add_argument("--solver", default="astar_boost")
+    play.add_argument("--seed", type=int, default=0)
+    play.add_argument("--corpus", help="Play board --index of this board corpus")
+    play.add_argument("--index", type=int, default=0)
+
+    run = sub.add_parser("run", help="Replay one or more logs")
+    run.add_argument("logs", nargs="+")
+    run.add_argument("--solver", help="Solver used to verify the solver moves")
+    run.add_argument(
+        "--verify",
+        action="store_true",
+        help="Recompute every solver move and report differences",
+    )
+    run.add_argument("--repeat", type=int, default=1, help="Replays per log")
+    run.add_argument("--corpus", help="Load the boards from this board corpus")
+    args = parser.parse_args(argv)
+    corpus = BoardCorpus(args.corpus) if args.corpus else None
+
+    if args.command == "record":
+        board = (args.width, args.height, args.mines)
+        seed, grid = args.seed, None
+        if corpus is not None:
+            seed = corpus.board_seed(*board, args.index)
+            grid = corpus.grid(*board, args.index)
+        log = record(*board, args.solver, seed, grid=grid)
+        log.save(args.output)
+        print(f"{len(log)} actions written to {args.output}")
+        return 0
+
+    failed = False
+    for path in args.logs:
+        log = MoveLog.load(path)
+        runs = [
+            replay(log, args.solver, verify=args.verify, corpus=corpus)
+            for _ in range(args.repeat)
+        ]
+        result = min(runs, key=lambda run: run["elapsed"])
+        result["path"] = path
+        print(json.dumps(result, indent=2, default=str))
+        failed = failed or bool(result.get("mismatches"))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,30 @@
+from solvers.astarsolver import AstarSolver
+from solvers.bitboard import Bitboard
+
+
+class AstarBitboardSolver(AstarSolver):
+    """A* solver whose deduction sweep runs on big-int bitboards."""
+
+    def __init__(self, game):
+        super().__init__(game)
+        self._grid = None  # Grid the cached number planes were built from
+        self._number_planes = None
+
+    def bitboard(self):
+        """Build a bitboard of the current state, reusing the number planes."""
+        if self._grid is not self.game.grid:
+            self._grid = self.game.grid
+            self._number_planes = None
+        board = Bitboard(self.game, self._number_planes)
+        self._number_planes = board.numbers
+        return board
+
+    def find_trivial_moves(self):
+        """Find obvious moves with whole-board bit operations."""
+        if not self.game.dense:
+            # Whole-board masks make no sense on a lazily generated board
+            return super().find_trivial_moves()
+        board = self.bitboard()
+        safe, mines = board.trivial_moves()
+        self.safe_moves = list(board.cells(safe))
+        self.flagged_cells = list(board.cells(mines))
@@ -1,162 +1,155 @@
 import random
 
+from solvers.basesolver import (
+    TIER_ENUMERATION,
+    TIER_GUESS,
+    TIER_SAMPLING,
+    TIER_SUBSET,
+    TIER_TRIVIAL,
+    BaseSolver,
+)
+from solvers.endgame import ENDGAME_THRESHOLD
+from solvers.frontier import (
+    EXACT_COMPONENT_LIMIT,
+    PARALLEL_COMPONENT_THRESHOLD,
+    SAMPLE_TIME_BUDGET,
+    FrontierAnalyzer,
+    frontier_constraints,
+    subset_moves,
+)
+
+
+class AstarBoostedSolver(BaseSolver):
+    exact_limit = EXACT_COMPONENT_LIMIT  # Larger ones may be sampled
+    sample_time = SAMPLE_TIME_BUDGET  # Seconds of sampling per large component
+    workers = None  # Processes analysing large components, None: default
+    parallel_threshold = PARALLEL_COMPONENT_THRESHOLD
+    endgame_threshold = ENDGAME_THRESHOLD  # Unknown cells left to solve exactly
 
-class AstarBoostedSolver:
     def __init__(self, game):
-        self.game = game
-        self.width = game.width
-        self.height = game.height
-        self.remaining_mines = game.num_mines
-        self.safe_moves = []  # List of (x, y) coordinates that are safe to reveal
-        self.flagged_cells = []  # List of (x, y) coordinates that should be flagged
-
-    def solve_step(self):
-        """Perform one step of the solving process."""
+        super().__init__(game)
+        self.last_analysis = None
+
+    def solve_step(self, deadline=None):
+        """
+        Perform one step of the solving process.
+
+        Tiers are tried cheapest first: single-cell rules, the subset rule on
+        pairs of constraints, the exact endgame once at most
+        ``endgame_threshold`` unknown cells remain, then the frontier analysis
+        (exact enumeration, sampling for the components too large to
+        enumerate). Once ``deadline`` has passed the remaining tiers are
+        skipped; an analysis already running stops early and still answers
+        with what it enumerated or sampled so far.
+
+        Args:
+            deadline (float): ``time.perf_counter()`` value the step should
+                finish by, or None for no limit
+        """
+        self.tier = None
         self.update_mine_count()
         self.find_trivial_moves()
 
         if self.safe_moves or self.flagged_cells:
+            self.tier = TIER_TRIVIAL
             return True
+        if self.expired(deadline):
+            return self.make_random_guess()
 
-        # Use advanced solving strategies
-        try:
-            x, y = self.probabilistic_frontier_solver()
-            self.safe_moves.append((x, y))
+        constraints = frontier_constraints(self.game, self.neighbors)
+        safe, mines = subset_moves(constraints)
+        if safe or mines:
+            self.safe_moves.extend(safe)
+            self.flagged_cells.extend(mines)
+            self.tier = TIER_SUBSET
             return True
-        except Exception:
+        if self.expired(deadline):
             return self.make_random_guess()
+        if self.find_endgame_moves(deadline):
+            return True
 
-    def update_mine_count(self):
-        """Update the remaining mine count based on flagged cells."""
-        flag_count = sum(sum(1 for cell in row if cell) for row in self.game.flagged)
-        self.remaining_mines = self.game.num_mines - flag_count
-
-    def get_unrevealed_neighbors(self, x, y):
-        """Get a list of unrevealed neighboring cells."""
-        neighbors = []
-        for dy in [-1, 0, 1]:
-            for dx in [-1, 0, 1]:
-                nx, ny = x + dx, y + dy
-                if (dx == 0 and dy == 0) or not (
-                    0 <= nx < self.width and 0 <= ny < self.height
-                ):
-                    continue
-                if not self.game.revealed[ny][nx]:
-                    neighbors.append((nx, ny))
-        return neighbors
-
-    def get_flagged_neighbors_count(self, x, y):
-        """Count the number of flagged neighboring cells."""
-        count = 0
-        for dy in [-1, 0, 1]:
-            for dx in [-1, 0, 1]:
-                nx, ny = x + dx, y + dy
-                if (dx == 0 and dy == 0) or not (
-                    0 <= nx < self.width and 0 <= ny < self.height
-                ):
-                    continue
-                if self.game.flagged[ny][nx]:
-                    count += 1
-        return count
+        # Use advanced solving strategies
+        try:
+            x, y = self.probabilistic_frontier_solver(deadline, constraints)
+        except ValueError:
+            # Wrong flags made the board inconsistent: no analysis can help
+            return self.make_random_guess()
+        self.safe_moves.append((x, y))
+        return True
 
     def find_trivial_moves(self):
         """Find obvious moves based on revealed cell numbers."""
         self.safe_moves = []
         self.flagged_cells = []
 
-        for y in range(self.height):
-            for x in range(self.width):
-                # Skip unrevealed or zero cells
-                if not self.game.revealed[y][x] or self.game.grid[y][x] <= 0:
-                    continue
-
-                unrevealed = self.get_unrevealed_neighbors(x, y)
-                flagged_count = self.get_flagged_neighbors_count(x, y)
-
-                # If unrevealed + flagged == cell number, all unrevealed are mines
-                if len(unrevealed) + flagged_count == self.game.grid[y][x]:
-                    for nx, ny in unrevealed:
-                        if not self.game.flagged[ny][nx]:
-                            self.flagged_cells.append((nx, ny))
-
-                # If flagged count equals cell number, all other unrevealed are safe
-                if flagged_count == self.game.grid[y][x]:
-                    for nx, ny in unrevealed:
-                        if (
-                            not self.game.flagged[ny][nx]
-                            and (nx, ny) not in self.safe_moves
-                        ):
-                            self.safe_moves.append((nx, ny))
-
-    def probabilistic_frontier_solver(self):
+        for x, y in self.game.revealed_cells():
+            # Skip zero cells
+            if self.game.grid[y][x] <= 0:
+                continue
+
+            unrevealed = self.get_unrevealed_neighbors(x, y)
+            flagged_count = self.get_flagged_neighbors_count(x, y)
+            # Flagged cells are unrevealed too; count them only once
+            unknown = [
+                (nx, ny) for nx, ny in unrevealed if not self.game.flagged[ny][nx]
+            ]
+
+            # If unknown + flagged == cell number, all unknown cells are mines
+            if len(unknown) + flagged_count == self.game.grid[y][x]:
+                self.flagged_cells.extend(unknown)
+
+            # If flagged count equals cell number, all unknown cells are safe
+            if flagged_count == self.game.grid[y][x]:
+                for cell in unknown:
+                    if cell not in self.safe_moves:
+                        self.safe_moves.append(cell)
+
+    def probabilistic_frontier_solver(self, deadline=None, constraints=None):
         """
         Advanced probabilistic solver tracking mine frontiers
         Estimates mine probabilities across board regions
+
+        Small frontier components are enumerated exactly; components above
+        ``exact_limit`` cells whose enumeration is too expensive are
+        estimated by weighted sampling within ``sample_time`` seconds.
+        Components above ``parallel_threshold`` cells are spread over
+        ``workers`` processes. Cells off the frontier share the density left
+        by the remaining mine count.
+
+        ``self.tier`` tells where the cell came from: ``TIER_ENUMERATION`` or
+        ``TIER_SAMPLING`` for a frontier cell, ``TIER_GUESS`` for a random
+        cell off the frontier (always the case on a fresh board).
+
+        Args:
+            deadline (float): ``time.perf_counter()`` value at which the
+                analysis stops and works with what it has
+            constraints (list): Frontier constraints, if already computed
+
+        Returns:
+            tuple: ``(x, y)`` of the cell to reveal
         """
-        frontier_cells = []
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.game.revealed[y][x]:
-                    unrevealed_neighbors = [
-                        (nx, ny)
-                        for nx in range(max(0, x - 1), min(self.width, x + 2))
-                        for ny in range(max(0, y - 1), min(self.height, y + 2))
-                        if not self.game.revealed[ny][nx]
-                        and not self.game.flagged[ny][nx]
-                    ]
-
-                    # Compute local mine probability
-                    remaining_mines = self.game.grid[y][
-                        x
-                    ] - self.get_flagged_neighbors_count(x, y)
-                    local_prob = (
-                        remaining_mines / len(unrevealed_neighbors)
-                        if unrevealed_neighbors
-                        else 0
-                    )
-
-                    frontier_cells.extend(
-                        (nx, ny, local_prob) for nx, ny in unrevealed_neighbors
-                    )
-
-        # If no frontier cells found, fall back to random
-        if not frontier_cells:
+        analysis = FrontierAnalyzer(
+            self,
+            exact_limit=self.exact_limit,
+            time_budget=self.sample_time,
+            workers=self.workers,
+            parallel_threshold=self.parallel_threshold,
+        ).analyze(deadline=deadline, constraints=constraints)
+        self.last_analysis = analysis
+        cell, probability = analysis.safest()
+
+        interior = analysis.interior_probability
+        if interior is not None and (cell is None or interior < probability):
             candidates = [
-                (x, y)
-                for y in range(self.height)
-                for x in range(self.width)
-                if not self.game.revealed[y][x] and not self.game.flagged[y][x]
+                cell
+                for cell in self.game.guess_candidates()
+                if cell not in analysis.probabilities
             ]
-            return random.choice(candidates) if candidates else (0, 0)
-
-        # Return cell with lowest probability of being a mine
-        return min(frontier_cells, key=lambda x: x[2])[:2]
-
-    def make_random_guess(self):
-        """Make a random guess when no other strategy works."""
-        candidates = [
-            (x, y)
-            for y in range(self.height)
-            for x in range(self.width)
-            if not self.game.revealed[y][x] and not self.game.flagged[y][x]
-        ]
-
-        if candidates:
-            self.safe_moves.append(random.choice(candidates))
-            return True
-        return False
-
-    def apply_moves(self):
-        """Apply the moves found by the solver to the game."""
-        # Apply flag moves first
-        for x, y in self.flagged_cells:
-            if not self.game.flagged[y][x]:
-                self.game.toggle_flag(x, y)
-
-        # Then reveal one safe cell (if any)
-        if self.safe_moves:
-            x, y = self.safe_moves[0]
-            self.game.reveal(x, y)
-            return True
-
-        return False
+            if candidates:
+                self.tier = TIER_GUESS
+                return random.choice(candidates)
+
+        if cell is None:
+            raise ValueError("No hidden cell left to reveal")
+        self.tier = TIER_ENUMERATION if analysis.exact else TIER_SAMPLING
+        return cell
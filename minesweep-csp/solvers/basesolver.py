@@ -0,0 +1,191 @@
+import random
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from solvers.endgame import solve_endgame
+
+# Above this many cells neighbours are computed on the fly: a table costs
+# roughly 200 bytes per cell, which is too much to keep for huge boards.
+MAX_TABLE_CELLS = 512 * 512
+# Board sizes whose table is kept; at MAX_TABLE_CELLS one table is about 50 MB
+NEIGHBOR_TABLE_CACHE = 4
+
+# Analysis tiers, roughly cheapest first; ``BaseSolver.tier`` names the one that
+# produced the last move
+TIER_TRIVIAL = "trivial"
+TIER_SUBSET = "subset"
+TIER_ENUMERATION = "enumeration"
+TIER_SAMPLING = "sampling"
+TIER_ENDGAME = "endgame"
+TIER_GUESS = "guess"
+TIERS = (
+    TIER_TRIVIAL,
+    TIER_SUBSET,
+    TIER_ENUMERATION,
+    TIER_SAMPLING,
+    TIER_ENDGAME,
+    TIER_GUESS,
+)
+
+
+def compute_neighbors(x, y, width, height):
+    """Coordinates of the (up to 8) cells surrounding (x, y)."""
+    return tuple(
+        (nx, ny)
+        for ny in range(max(0, y - 1), min(height, y + 2))
+        for nx in range(max(0, x - 1), min(width, x + 2))
+        if nx != x or ny != y
+    )
+
+
+@lru_cache(maxsize=NEIGHBOR_TABLE_CACHE)
+def neighbor_table(width, height):
+    """
+    Neighbour coordinates of every cell of a board, indexed by ``y * width + x``.
+
+    The table only depends on the board dimensions, so it is built once and
+    shared by every solver (and every game) of the same size. Only the last
+    ``NEIGHBOR_TABLE_CACHE`` sizes are kept, which bounds the memory held by
+    each process (worker processes included) to a few hundred MB at most.
+
+    Args:
+        width (int): Width of the board
+        height (int): Height of the board
+
+    Returns:
+        list: One tuple of ``(x, y)`` neighbours per cell
+    """
+    # Share one tuple per coordinate between all the entries that contain it
+    cells = [(x, y) for y in range(height) for x in range(width)]
+    table = []
+    for y in range(height):
+        for x in range(width):
+            table.append(
+                tuple(
+                    cells[ny * width + nx]
+                    for ny in range(max(0, y - 1), min(height, y + 2))
+                    for nx in range(max(0, x - 1), min(width, x + 2))
+                    if nx != x or ny != y
+                )
+            )
+    return table
+
+
+class BaseSolver(ABC):
+    """Common state and board helpers shared by every solver."""
+
+    # Solve exactly once this few unknown cells remain (0 disables it)
+    endgame_threshold = 0
+
+    def __init__(self, game):
+        self.game = game
+        self.width = game.width
+        self.height = game.height
+        self.remaining_mines = game.num_mines
+        self.safe_moves = []  # List of (x, y) coordinates that are safe to reveal
+        self.flagged_cells = []  # List of (x, y) coordinates that should be flagged
+        self.tier = None  # Analysis tier that produced the last move
+        if self.width * self.height <= MAX_TABLE_CELLS:
+            self._neighbors = neighbor_table(self.width, self.height)
+        else:
+            self._neighbors = None
+
+    @abstractmethod
+    def solve_step(self, deadline=None):
+        """
+        Perform one step of the solving process.
+
+        Solvers escalate through the tiers of ``TIERS`` and stop at the first
+        one that finds a move. Past ``deadline`` they skip the remaining
+        analysis and return the best move found so far (a guess if needed).
+
+        Args:
+            deadline (float): ``time.perf_counter()`` value the step should
+                finish by, or None for no limit
+
+        Returns:
+            bool: True if a move was found
+        """
+
+    @staticmethod
+    def expired(deadline):
+        """Whether ``deadline`` (a ``time.perf_counter()`` value) has passed."""
+        return deadline is not None and time.perf_counter() >= deadline
+
+    def neighbors(self, x, y):
+        """Get the coordinates of the cells surrounding (x, y)."""
+        if self._neighbors is not None:
+            return self._neighbors[y * self.width + x]
+        return compute_neighbors(x, y, self.width, self.height)
+
+    def update_mine_count(self):
+        """Update the remaining mine count based on flagged cells."""
+        self.remaining_mines = self.game.num_mines - self.game.flag_count
+
+    def get_unrevealed_neighbors(self, x, y):
+        """Get a list of unrevealed neighboring cells."""
+        revealed = self.game.revealed
+        return [(nx, ny) for nx, ny in self.neighbors(x, y) if not revealed[ny][nx]]
+
+    def get_flagged_neighbors_count(self, x, y):
+        """Count the number of flagged neighboring cells."""
+        flagged = self.game.flagged
+        count = 0
+        for nx, ny in self.neighbors(x, y):
+            if flagged[ny][nx]:
+                count += 1
+        return count
+
+    def find_endgame_moves(self, deadline=None):
+        """
+        Solve the endgame exactly once few enough unknown cells remain.
+
+        Every completion of the unknown cells is counted, so certain moves
+        are found even when only the remaining mine count implies them, and
+        otherwise the guess least likely to hit a mine is chosen.
+
+        Args:
+            deadline (float): ``time.perf_counter()`` value at which to give up
+
+        Returns:
+            bool: True if the endgame produced a move
+        """
+        unknown = self.game.unknown_count()
+        if not unknown or unknown > self.endgame_threshold:
+            return False
+        solution = solve_endgame(self.game, self.neighbors, deadline)
+        if solution is None:
+            return False
+
+        self.flagged_cells = solution.mine_cells()
+        self.safe_moves = solution.safe_cells()
+        if not self.safe_moves and not self.flagged_cells:
+            self.safe_moves.append(random.choice(solution.safest()))
+        self.tier = TIER_ENDGAME
+        return True
+
+    def make_random_guess(self):
+        """Make a random guess among the hidden, unflagged cells."""
+        candidates = self.game.guess_candidates()
+
+        if candidates:
+            self.safe_moves.append(random.choice(candidates))
+            self.tier = TIER_GUESS
+            return True
+        return False
+
+    def apply_moves(self):
+        """Apply the moves found by the solver to the game."""
+        # Apply flag moves first
+        for x, y in self.flagged_cells:
+            if not self.game.flagged[y][x]:
+                self.game.toggle_flag(x, y)
+
+        # Then reveal one safe cell (if any)
+        if self.safe_moves:
+            x, y = self.safe_moves[0]
+            self.game.reveal(x, y)
+            return True
+
+        return False
@@ -0,0 +1,167 @@
+from array import array
+from functools import lru_cache
+from itertools import chain, repeat
+
+# byte value -> b"0"/b"1" for the given bit, used with bytes.translate
+_BIT_CHARS = [
+    bytes(ord("1") if (value >> bit) & 1 else ord("0") for value in range(256))
+    for bit in range(8)
+]
+_NUMBER_BITS = 4  # Cell numbers go from 0 to 8
+
+
+@lru_cache(maxsize=16)
+def board_layout(width, height):
+    """
+    Precomputed masks describing the bit layout of a board.
+
+    Cell (x, y) is stored at bit ``(y + 1) * stride + x + 1`` with
+    ``stride = width + 2``: a padding column on each side and a padding row
+    above and below keep neighbour shifts from wrapping around the board.
+
+    Args:
+        width (int): Width of the board
+        height (int): Height of the board
+
+    Returns:
+        tuple: ``(stride, board_mask, neighbor_shifts, window)`` where
+            ``neighbor_shifts`` are the bit offsets of the 8 neighbours and
+            ``window`` is the 3x3 neighbour mask of the cell at bit
+            ``stride + 1``
+    """
+    stride = width + 2
+    row = ((1 << width) - 1) << 1
+    board = 0
+    for y in range(height):
+        board |= row << ((y + 1) * stride)
+    shifts = (1, stride - 1, stride, stride + 1)
+    window = 0b111 | 0b101 << stride | 0b111 << (2 * stride)
+    return stride, board, shifts, window
+
+
+class Bitboard:
+    """
+    Board state as Python big-int bitsets.
+
+    ``revealed`` and ``flagged`` hold one bit per cell and ``numbers`` holds
+    the cell values bit-sliced into 4 planes, so neighbour counts for the
+    whole board are computed with a few dozen shifts, ANDs and XORs instead
+    of a Python loop per cell.
+    """
+
+    def __init__(self, game, number_planes=None):
+        """
+        Args:
+            game (MinesweeperBackend): Game to read the state from
+            number_planes (tuple): Planes from a previous bitboard of the same
+                game; the numbers never change so they can be reused
+        """
+        self.width = game.width
+        self.height = game.height
+        self.stride, self.board, self.shifts, self.window = board_layout(
+            self.width, self.height
+        )
+        self.revealed = self._to_mask(bytes(self._layout(game.revealed)))
+        self.flagged = self._to_mask(bytes(self._layout(game.flagged)))
+        if number_planes is None:
+            # Mines (-1) are stored as 0xFF; they are never revealed so their
+            # bits are always masked out
+            data = array("b", self._layout(game.grid)).tobytes()
+            number_planes = tuple(
+                self._to_mask(data, bit) for bit in range(_NUMBER_BITS)
+            )
+        self.numbers = number_planes
+
+    def _layout(self, rows):
+        """Iterate over the cells of ``rows`` in bit order, padding included."""
+        pad = (0,)
+        return chain(
+            repeat(0, self.stride),
+            chain.from_iterable(chain(pad, row, pad) for row in rows),
+        )
+
+    @staticmethod
+    def _to_mask(data, bit=0):
+        """Turn one byte per cell into an int holding ``bit`` of every byte."""
+        # int() parses the most significant digit first, hence the reversal
+        return int(data[::-1].translate(_BIT_CHARS[bit]) or b"0", 2)
+
+    def index(self, x, y):
+        """Bit index of cell (x, y)."""
+        return (y + 1) * self.stride + x + 1
+
+    def cells(self, mask):
+        """Yield the (x, y) coordinates of the bits set in ``mask``."""
+        stride = self.stride
+        while mask:
+            low = mask & -mask
+            y, x = divmod(low.bit_length() - 1, stride)
+            yield x - 1, y - 1
+            mask ^= low
+
+    def neighbor_mask(self, x, y):
+        """Mask of the cells surrounding (x, y)."""
+        return (self.window << (y * self.stride + x)) & self.board
+
+    def count_neighbors(self, mask, x, y):
+        """Number of cells of ``mask`` around (x, y): one AND plus a popcount."""
+        return (mask & self.neighbor_mask(x, y)).bit_count()
+
+    def neighbor_counts(self, mask):
+        """
+        Per-cell count of neighbours in ``mask``, bit-sliced into 4 planes.
+
+        Bit ``i`` of ``planes[k]`` is bit ``k`` of the number of cells of
+        ``mask`` around cell ``i``. The 8 shifted copies of the mask are
+        summed with a ripple-carry adder working on every cell at once.
+        """
+        b0 = b1 = b2 = b3 = 0
+        for shift in self.shifts:
+            for shifted in (mask << shift, mask >> shift):
+                carry = b0 & shifted
+                b0 ^= shifted
+                carry, b1 = b1 & carry, b1 ^ carry
+                carry, b2 = b2 & carry, b2 ^ carry
+                b3 |= carry
+        return b0, b1, b2, b3
+
+    def dilate(self, mask):
+        """Mask of every cell adjacent to a cell of ``mask``."""
+        grown = 0
+        for shift in self.shifts:
+            grown |= (mask << shift) | (mask >> shift)
+        return grown & self.board
+
+    @staticmethod
+    def equal(planes_a, planes_b):
+        """Mask of the cells where two bit-sliced counts are equal."""
+        diff = 0
+        for a, b in zip(planes_a, planes_b):
+            diff |= a ^ b
+        return ~diff
+
+    def trivial_moves(self):
+        """
+        Apply the single-cell rules of ``AstarSolver.find_trivial_moves``.
+
+        A revealed cell whose number equals its count of hidden neighbours
+        (flagged or not) has only mines around it; one whose number equals
+        its count of flagged neighbours has only safe cells around it. As in
+        ``AstarSolver``, a cell matching both rules is only a mine, and
+        ``cells`` lists the masks row by row, so both solvers find the same
+        moves in the same order.
+
+        Returns:
+            tuple: ``(safe, mines)`` masks of unflagged hidden cells
+        """
+        hidden = self.board & ~self.revealed
+        unknown = hidden & ~self.flagged
+        hidden_counts = self.neighbor_counts(hidden)
+        flagged_counts = self.neighbor_counts(self.flagged)
+
+        saturated = self.revealed & self.equal(hidden_counts, self.numbers)
+        satisfied = self.revealed & self.equal(flagged_counts, self.numbers)
+
+        mines = self.dilate(saturated) & unknown
+        safe = self.dilate(satisfied) & unknown & ~mines
+        return safe, mines
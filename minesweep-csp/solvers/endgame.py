@@ -0,0 +1,206 @@
+import time
+
+# Solvers switch to the exact endgame below this many unknown cells
+ENDGAME_THRESHOLD = 30
+
+
+class EndgameSolution:
+    """Exact mine counts over every completion of the board."""
+
+    def __init__(self, cells, mine_counts, total):
+        """
+        Args:
+            cells (list): Unknown (hidden, unflagged) cells
+            mine_counts (list): Completions with a mine on each cell
+            total (int): Number of consistent completions
+        """
+        self.cells = cells
+        self.mine_counts = mine_counts
+        self.total = total
+
+    @property
+    def probabilities(self):
+        """Mine probability of every unknown cell."""
+        return {
+            cell: count / self.total
+            for cell, count in zip(self.cells, self.mine_counts)
+        }
+
+    def safe_cells(self):
+        """Cells that hold no mine in any completion."""
+        return [cell for cell, n in zip(self.cells, self.mine_counts) if n == 0]
+
+    def mine_cells(self):
+        """Cells that hold a mine in every completion."""
+        return [
+            cell for cell, n in zip(self.cells, self.mine_counts) if n == self.total
+        ]
+
+    def safest(self):
+        """Cells sharing the lowest mine probability."""
+        best = min(self.mine_counts)
+        return [cell for cell, n in zip(self.cells, self.mine_counts) if n == best]
+
+
+def unknown_cells(game):
+    """Hidden, unflagged cells of ``game`` in row-major order."""
+    return [
+        (x, y)
+        for y in range(game.height)
+        for x in range(game.width)
+        if not game.revealed[y][x] and not game.flagged[y][x]
+    ]
+
+
+def solve_endgame(game, neighbors, deadline=None):
+    """
+    Count every completion of the unknown cells consistent with the board.
+
+    Unlike the frontier analysis, the cells away from the frontier are part
+    of the search and the total mine count is a hard constraint. Cells are
+    assigned one layer at a time; the state of a partial assignment is the
+    number of mines used so far plus the mines assigned to each constraint
+    still open, so equal states reached along different paths are merged
+    (memoised) instead of being searched again. A forward pass counts the
+    ways to reach every state and a backward pass counts the ways to
+    complete it; a cell's mine count is the sum of their products over its
+    "mine" transitions.
+
+    Args:
+        game (MinesweeperBackend): Game to solve
+        neighbors (callable): ``neighbors(x, y)`` returning surrounding cells
+        deadline (float): ``time.perf_counter()`` value at which to give up
+
+    Returns:
+        EndgameSolution: Exact counts, or None if the flags leave no
+            consistent completion or ``deadline`` passed
+    """
+    remaining = game.num_mines - game.flag_count
+    cells = unknown_cells(game)
+    index = {cell: i for i, cell in enumerate(cells)}
+
+    needs = []
+    members = []
+    for y in range(game.height):
+        for x in range(game.width):
+            if not game.revealed[y][x] or game.grid[y][x] < 0:
+                continue
+            need = game.grid[y][x]
+            unknown = []
+            for nx, ny in neighbors(x, y):
+                if game.flagged[ny][nx]:
+                    need -= 1
+                elif not game.revealed[ny][nx]:
+                    unknown.append(index[(nx, ny)])
+            if unknown:
+                needs.append(need)
+                members.append(unknown)
+            elif need != 0:
+                return None
+
+    order = _locality_order(len(cells), members)
+    position = {cell: depth for depth, cell in enumerate(order)}
+    n = len(order)
+
+    # Constraints touched by each layer, cells of each constraint assigned
+    # after a layer, and the constraints still open after each layer: a
+    # state only keeps the mine counts of the open ones
+    cell_constraints = [[] for _ in range(n)]
+    cells_after = [{} for _ in range(n)]
+    open_after = [[] for _ in range(n)]
+    for c, cons in enumerate(members):
+        depths = sorted(position[i] for i in cons)
+        for k, depth in enumerate(depths):
+            cell_constraints[depth].append(c)
+            cells_after[depth][c] = len(depths) - k - 1
+        for depth in range(depths[0], depths[-1]):
+            open_after[depth].append(c)
+
+    # Forward pass: ways to reach each state, and the transitions taken
+    layers = [{(0, ()): 1}]
+    transitions = []
+    for depth in range(n):
+        if deadline is not None and time.perf_counter() >= deadline:
+            return None
+        before = open_after[depth - 1] if depth else []
+        after = open_after[depth]
+        slot = {c: k for k, c in enumerate(before)}
+        touched = cell_constraints[depth]
+        slack = cells_after[depth]
+        left_after = n - depth - 1
+        layer = {}
+        moves = {}
+        for state, ways in layers[-1].items():
+            mines, counts = state
+            for value in (0, 1):
+                used = mines + value
+                if used > remaining or used + left_after < remaining:
+                    continue
+                assigned = {}
+                ok = True
+                for c in touched:
+                    count = (counts[slot[c]] if c in slot else 0) + value
+                    if count > needs[c]:
+                        ok = False
+                        break
+                    if needs[c] - count > slack[c]:
+                        ok = False
+                        break
+                    assigned[c] = count
+                if not ok:
+                    continue
+                new_counts = tuple(
+                    assigned[c] if c in assigned else counts[slot[c]] for c in after
+                )
+                target = (used, new_counts)
+                layer[target] = layer.get(target, 0) + ways
+                moves.setdefault(state, []).append((value, target))
+        layers.append(layer)
+        transitions.append(moves)
+
+    total = layers[n].get((remaining, ()), 0)
+    if not total:
+        return None
+
+    # Backward pass: ways to complete each state
+    completions = {(remaining, ()): 1}
+    mine_counts = [0] * n
+    for depth in range(n - 1, -1, -1):
+        previous = {}
+        for state, moves in transitions[depth].items():
+            ways = 0
+            for value, target in moves:
+                rest = completions.get(target, 0)
+                if rest:
+                    ways += rest
+                    if value:
+                        mine_counts[depth] += layers[depth][state] * rest
+            if ways:
+                previous[state] = ways
+        completions = previous
+
+    return EndgameSolution([cells[i] for i in order], mine_counts, total)
+
+
+def _locality_order(n, members):
+    """Order cells so that constraints open and close within few layers."""
+    cell_constraints = [[] for _ in range(n)]
+    for c, cons in enumerate(members):
+        for i in cons:
+            cell_constraints[i].append(c)
+    order = []
+    seen = [False] * n
+    # Constrained cells first, breadth-first; unconstrained cells last
+    for start in sorted(range(n), key=lambda i: not cell_constraints[i]):
+        if seen[start]:
+            continue
+        seen[start] = True
+        queue = [start]
+        for i in queue:
+            order.append(i)
+            for c in cell_constraints[i]:
+                for j in members[c]:
+                    if not seen[j]:
+                        seen[j] = True
+                        queue.append(j)
+    return order
@@ -0,0 +1,922 @@
+import atexit
+import math
+import multiprocessing
+import os
+import random
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Components up to this many cells are always enumerated exactly
+EXACT_COMPONENT_LIMIT = 24
+# Larger components are enumerated while the search stays below this many
+# nodes (most have few solutions), and estimated by sampling otherwise
+EXACT_NODE_LIMIT = 50_000
+# Search nodes allowed to find one solution when sampling falls back to search
+RANDOM_SOLUTION_NODE_LIMIT = 10_000
+# Default anytime budget of the sampler, per component, in seconds
+SAMPLE_TIME_BUDGET = 0.02
+MIN_SAMPLES = 200
+MAX_SAMPLES = 20_000
+# z-score of the reported confidence intervals (95%)
+CONFIDENCE_Z = 1.96
+# Components with more cells than this may be sent to worker processes
+PARALLEL_COMPONENT_THRESHOLD = 16
+
+# Raised when the pool cannot start, has died, or was shut down by another
+# thread while a request was waiting on it
+_POOL_ERRORS = (
+    BrokenProcessPool,
+    CancelledError,
+    OSError,
+    RuntimeError,
+    AssertionError,
+)
+
+# Request threads of the server share the pool
+_executor_lock = threading.Lock()
+_executor = None
+_executor_workers = 0
+
+
+def default_workers():
+    """
+    Worker processes used when an analyzer is not given a number.
+
+    One per CPU in the main process (the server, or a sequential run). Child
+    processes, such as the benchmark workers, already run in parallel and
+    daemonic ones cannot have children at all, so they analyse inline.
+    """
+    if multiprocessing.parent_process() is not None:
+        return 1
+    return os.cpu_count() or 1
+
+
+def _pool_context():
+    # Forking a multi-threaded server can copy locks held by other threads
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"
+    )
+
+
+def get_executor(workers):
+    """
+    Process pool shared by every analyzer, created on first use.
+
+    Workers are started with forkserver (spawn where it is not available)
+    rather than forked from a possibly multi-threaded process.
+
+    Args:
+        workers (int): Number of worker processes
+
+    Returns:
+        ProcessPoolExecutor: The pool, or None when ``workers`` is below 2,
+            in a daemonic process or when the pool cannot be created
+    """
+    global _executor, _executor_workers
+    if workers < 2 or multiprocessing.current_process().daemon:
+        return None
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                # Analyses still using the old pool are left to finish
+                _executor.shutdown(wait=False)
+            try:
+                _executor = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=_pool_context()
+                )
+            except _POOL_ERRORS:
+                _executor = None
+                _executor_workers = 0
+                return None
+            _executor_workers = workers
+        return _executor
+
+
+@atexit.register
+def shutdown_executor(executor=None):
+    """
+    Stop the shared worker processes, if any.
+
+    Args:
+        executor (ProcessPoolExecutor): Only stop the pool if it is still
+            this one, so a thread recovering from a broken pool does not
+            stop a newer pool used by other threads
+    """
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or executor not in (None, _executor):
+            return
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        _executor_workers = 0
+
+
+def frontier_constraints(game, neighbors):
+    """
+    Build one constraint per revealed number touching unknown cells.
+
+    Args:
+        game (MinesweeperBackend): Game to read
+        neighbors (callable): ``neighbors(x, y)`` returning surrounding cells
+
+    Returns:
+        list: Unique ``(cells, mines)`` pairs where ``cells`` is a sorted
+            tuple of hidden unflagged cells and ``mines`` the number of mines
+            among them
+    """
+    constraints = set()
+    revealed = game.revealed
+    flagged = game.flagged
+    grid = game.grid
+    for x, y in game.revealed_cells():
+        if grid[y][x] <= 0:
+            continue
+        unknown = []
+        mines = grid[y][x]
+        for nx, ny in neighbors(x, y):
+            if flagged[ny][nx]:
+                mines -= 1
+            elif not revealed[ny][nx]:
+                unknown.append((nx, ny))
+        if unknown:
+            constraints.add((tuple(sorted(unknown)), mines))
+    return list(constraints)
+
+
+def split_components(constraints):
+    """
+    Group constraints into independent components sharing no cell.
+
+    Returns:
+        list: ``(cells, constraints)`` per component, cells sorted
+    """
+    parent = {}
+
+    def find(cell):
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    for cells, _ in constraints:
+        for cell in cells:
+            parent.setdefault(cell, cell)
+        root = find(cells[0])
+        for cell in cells[1:]:
+            other = find(cell)
+            if other != root:
+                parent[other] = root
+
+    groups = {}
+    for constraint in constraints:
+        groups.setdefault(find(constraint[0][0]), []).append(constraint)
+    components = []
+    for group in groups.values():
+        cells = sorted({cell for cells, _ in group for cell in cells})
+        components.append((cells, group))
+    return components
+
+
+def subset_moves(constraints):
+    """
+    Apply the subset rule to every pair of nested constraints.
+
+    When the cells of constraint A are all cells of constraint B, the cells
+    of B outside A hold exactly ``mines(B) - mines(A)`` mines: they are all
+    safe when that is 0 and all mines when it equals their count.
+
+    Args:
+        constraints (list): ``(cells, mines)`` pairs from
+            ``frontier_constraints``
+
+    Returns:
+        tuple: ``(safe, mines)`` sorted lists of cells
+    """
+    by_cell = {}
+    for c, (cells, _) in enumerate(constraints):
+        for cell in cells:
+            by_cell.setdefault(cell, []).append(c)
+    sets = [frozenset(cells) for cells, _ in constraints]
+
+    safe = set()
+    mines = set()
+    for a, (cells_a, mines_a) in enumerate(constraints):
+        # A superset of A contains its first cell
+        for b in by_cell[cells_a[0]]:
+            if len(sets[b]) <= len(sets[a]) or not sets[a] <= sets[b]:
+                continue
+            rest = sets[b] - sets[a]
+            extra = constraints[b][1] - mines_a
+            if extra == 0:
+                safe |= rest
+            elif extra == len(rest):
+                mines |= rest
+    # Overlaps only happen on boards made inconsistent by wrong flags
+    return sorted(safe - mines), sorted(mines - safe)
+
+
+class ComponentResult:
+    """
+    Weighted mine-count distribution of one frontier component.
+
+    ``weights[k]`` is the (possibly estimated and rescaled) number of
+    assignments of the component with ``k`` mines, and ``cell_weights[k][i]``
+    the part of it where cell ``i`` holds a mine. Results of different
+    components only need to be consistent up to a constant factor each.
+    """
+
+    def __init__(self, cells, weights, cell_weights, exact, probes=None):
+        self.cells = cells
+        self.weights = weights
+        self.cell_weights = cell_weights
+        self.exact = exact
+        # Sampled assignments as (mine count, log weight, mine bitmask)
+        self.probes = probes or []
+
+    @property
+    def samples(self):
+        return len(self.probes)
+
+
+class _Component:
+    """Cells and constraints of a component, indexed for the search."""
+
+    def __init__(self, cells, constraints):
+        self.cells = cells
+        index = {cell: i for i, cell in enumerate(cells)}
+        self.need = [mines for _, mines in constraints]
+        self.size = [len(cons_cells) for cons_cells, _ in constraints]
+        self.cell_constraints = [[] for _ in cells]
+        for c, (cons_cells, _) in enumerate(constraints):
+            for cell in cons_cells:
+                self.cell_constraints[index[cell]].append(c)
+
+        # Breadth-first order so constraints are closed as early as possible
+        self.members = members = [
+            [index[cell] for cell in cons_cells] for cons_cells, _ in constraints
+        ]
+        self.order = []
+        seen = [False] * len(cells)
+        for start in range(len(cells)):
+            if seen[start]:
+                continue
+            seen[start] = True
+            queue = [start]
+            for i in queue:
+                self.order.append(i)
+                for c in self.cell_constraints[i]:
+                    for j in members[c]:
+                        if not seen[j]:
+                            seen[j] = True
+                            queue.append(j)
+
+    def fresh_state(self):
+        """Mines assigned and cells left to assign, per constraint."""
+        return [0] * len(self.need), list(self.size)
+
+    def options(self, i, assigned, left):
+        """Values cell ``i`` can take without making a constraint unsatisfiable."""
+        can_empty = can_mine = True
+        for c in self.cell_constraints[i]:
+            rest = left[c] - 1
+            if assigned[c] + rest < self.need[c]:
+                can_empty = False
+            if assigned[c] + 1 > self.need[c]:
+                can_mine = False
+        return can_empty, can_mine
+
+    def assign(self, i, value, assigned, left, sign=1):
+        for c in self.cell_constraints[i]:
+            left[c] -= sign
+            assigned[c] += value * sign
+
+    def probe(self, rng, q, log_mine, log_empty):
+        """
+        Draw one random assignment, propagating forced cells after each choice.
+
+        Free cells are set to "mine" with probability ``q``; cells forced by
+        a constraint (all its remaining cells must be mines, or none can be)
+        are set without a choice.
+
+        Returns:
+            tuple: ``(mines, log_weight, mask)`` where ``log_weight`` is minus
+                the log-probability of the choices made, or None on a dead end
+        """
+        need = self.need
+        members = self.members
+        cell_constraints = self.cell_constraints
+        assigned, left = self.fresh_state()
+        values = [-1] * len(self.cells)
+        log_weight = 0.0
+        mines = 0
+        mask = 0
+        for start in self.order:
+            if values[start] != -1:
+                continue
+            can_empty, can_mine = self.options(start, assigned, left)
+            if can_empty and can_mine:
+                value = 1 if rng.random() < q else 0
+                log_weight += log_mine if value else log_empty
+            elif can_empty or can_mine:
+                value = 1 if can_mine else 0
+            else:
+                return None
+
+            pending = [(start, value)]
+            while pending:
+                i, value = pending.pop()
+                if values[i] != -1:
+                    if values[i] != value:
+                        return None
+                    continue
+                values[i] = value
+                if value:
+                    mines += 1
+                    mask |= 1 << i
+                for c in cell_constraints[i]:
+                    left[c] -= 1
+                    assigned[c] += value
+                    missing = need[c] - assigned[c]
+                    if missing < 0 or missing > left[c]:
+                        return None
+                    if left[c] and (missing == 0 or missing == left[c]):
+                        forced = 1 if missing else 0
+                        pending.extend(
+                            (j, forced) for j in members[c] if values[j] == -1
+                        )
+        return mines, log_weight, mask
+
+    def random_solution(self, rng, q, node_limit):
+        """
+        Find one satisfying assignment by backtracking in a random value order.
+
+        Used when every weighted probe hits a dead end: the solutions found
+        this way are not drawn uniformly, but they keep the estimate going on
+        tightly constrained components.
+
+        Returns:
+            tuple: ``(mines, 0.0, mask)`` like ``probe``, or None when
+                ``node_limit`` nodes were searched without finding a solution
+        """
+        order = self.order
+        assigned, left = self.fresh_state()
+        n = len(order)
+        values = [-1] * n
+        # choices[depth] lists the values still to try at that depth
+        choices = [None] * n
+        depth = 0
+        nodes = 0
+        while depth < n:
+            i = order[depth]
+            if choices[depth] is None:
+                nodes += 1
+                if nodes > node_limit:
+                    return None
+                can_empty, can_mine = self.options(i, assigned, left)
+                tries = [v for v, ok in ((0, can_empty), (1, can_mine)) if ok]
+                if len(tries) == 2 and rng.random() < q:
+                    tries.reverse()
+                choices[depth] = tries
+            elif values[i] != -1:
+                self.assign(i, values[i], assigned, left, sign=-1)
+                values[i] = -1
+            if choices[depth]:
+                values[i] = choices[depth].pop(0)
+                self.assign(i, values[i], assigned, left)
+                depth += 1
+                continue
+            choices[depth] = None
+            if depth == 0:
+                return None
+            depth -= 1
+        mask = 0
+        for i, value in enumerate(values):
+            if value:
+                mask |= 1 << i
+        return sum(values), 0.0, mask
+
+
+def enumerate_component(cells, constraints, node_limit=EXACT_NODE_LIMIT, deadline=None):
+    """
+    Count every assignment of a component by backtracking.
+
+    The search keeps its own stack rather than recursing, so components of
+    thousands of cells do not hit Python's recursion limit.
+
+    Args:
+        cells (list): Cells of the component
+        constraints (list): ``(cells, mines)`` constraints of the component
+        node_limit (int): Give up after this many search nodes (None: never)
+        deadline (float): Give up at this ``time.perf_counter()`` value
+
+    Returns:
+        ComponentResult: Exact counts, or None if ``node_limit`` was exceeded
+            or ``deadline`` passed
+    """
+    comp = _Component(cells, constraints)
+    assigned, left = comp.fresh_state()
+    n = len(cells)
+    weights = {}
+    cell_weights = {}
+    values = [0] * n
+    nodes = 0
+
+    order = comp.order
+    need = comp.need
+    cell_constraints = comp.cell_constraints
+
+    # step[depth]: 0 on entry, 1 once "empty" was tried, 2 once "mine" was
+    can_mine = [False] * n
+    step = [0] * (n + 1)
+    depth = 0
+    mines = 0
+    while depth >= 0:
+        if step[depth] == 0:
+            nodes += 1
+            if node_limit is not None and nodes > node_limit:
+                return None
+            if deadline is not None and not nodes & 1023:
+                if time.perf_counter() >= deadline:
+                    return None
+        if depth == n:
+            weights[mines] = weights.get(mines, 0) + 1
+            counts = cell_weights.setdefault(mines, [0] * n)
+            for i in range(n):
+                counts[i] += values[i]
+            depth -= 1
+            continue
+
+        # Inlined _Component.options/assign: this is the hot loop
+        i = order[depth]
+        touched = cell_constraints[i]
+        if step[depth] == 0:
+            can_empty = can_mine[depth] = True
+            for c in touched:
+                if assigned[c] + left[c] - 1 < need[c]:
+                    can_empty = False
+                if assigned[c] >= need[c]:
+                    can_mine[depth] = False
+            for c in touched:
+                left[c] -= 1
+            step[depth] = 1
+            if can_empty:
+                depth += 1
+                step[depth] = 0
+                continue
+        if step[depth] == 1:
+            step[depth] = 2
+            if can_mine[depth]:
+                values[i] = 1
+                mines += 1
+                for c in touched:
+                    assigned[c] += 1
+                depth += 1
+                step[depth] = 0
+                continue
+        if values[i]:
+            for c in touched:
+                assigned[c] -= 1
+            values[i] = 0
+            mines -= 1
+        for c in touched:
+            left[c] += 1
+        depth -= 1
+    return ComponentResult(cells, weights, cell_weights, exact=True)
+
+
+def sample_component(
+    cells,
+    constraints,
+    density,
+    time_budget=SAMPLE_TIME_BUDGET,
+    min_samples=MIN_SAMPLES,
+    max_samples=MAX_SAMPLES,
+    rng=None,
+    deadline=None,
+):
+    """
+    Estimate the mine-count distribution of a component by weighted sampling.
+
+    Each probe assigns the cells in search order, only choosing values that
+    keep every constraint satisfiable, propagating the cells this forces, and
+    picks "mine" with probability close to ``density``. The probe is weighted
+    by the inverse of the probability of the path it took (Knuth's
+    estimator), which makes the weighted sums unbiased estimates of the exact
+    counts. Dead ends get a zero weight; if every probe dies, solutions found
+    by randomised backtracking are used instead, with equal weights. Sampling
+    stops when ``time_budget`` is spent (after at least ``min_samples``
+    probes) or after ``max_samples`` probes, and at ``deadline``; one probe,
+    and one backtracking search if it dies, run even past the deadline so
+    the estimate is never empty on a consistent component.
+
+    Args:
+        cells (list): Cells of the component
+        constraints (list): ``(cells, mines)`` constraints of the component
+        density (float): Expected mine density of unknown cells
+        time_budget (float): Anytime budget in seconds
+        min_samples (int): Probes drawn regardless of the budget
+        max_samples (int): Hard cap on the number of probes
+        rng (random.Random): Source of randomness
+        deadline (float): ``time.perf_counter()`` value at which to stop,
+            even before ``min_samples`` probes
+
+    Returns:
+        ComponentResult: Estimated, rescaled counts and the probes; the
+            weights are only empty when no solution could be found
+    """
+    rng = rng or random
+    comp = _Component(cells, constraints)
+    n = len(cells)
+    q = min(0.95, max(0.05, density))
+    log_mine, log_empty = -math.log(q), -math.log(1 - q)
+
+    hard_stop = deadline if deadline is not None else math.inf
+    deadline = min(time.perf_counter() + time_budget, hard_stop)
+    probes = []
+    attempts = 0
+    while attempts < max_samples:
+        now = time.perf_counter()
+        if attempts and (
+            now >= hard_stop or (attempts >= min_samples and now >= deadline)
+        ):
+            break
+        attempts += 1
+        probe = comp.probe(rng, q, log_mine, log_empty)
+        if probe is not None:
+            probes.append(probe)
+    if not probes:
+        # Every probe died: fall back to equally weighted backtracking
+        # solutions rather than giving up on the component
+        attempts = 0
+        while not attempts or (
+            time.perf_counter() < hard_stop
+            and (attempts < min_samples // 10 or time.perf_counter() < deadline)
+        ):
+            probe = comp.random_solution(rng, q, RANDOM_SOLUTION_NODE_LIMIT)
+            if probe is None:
+                break
+            probes.append(probe)
+            attempts += 1
+
+    weights = {}
+    cell_weights = {}
+    if probes:
+        top = max(log_weight for _, log_weight, _ in probes)
+        for mines, log_weight, mask in probes:
+            # Dividing by every attempt, dead ends included, keeps it unbiased
+            w = math.exp(log_weight - top) / attempts
+            weights[mines] = weights.get(mines, 0.0) + w
+            counts = cell_weights.setdefault(mines, [0.0] * n)
+            while mask:
+                low = mask & -mask
+                counts[low.bit_length() - 1] += w
+                mask ^= low
+    return ComponentResult(cells, weights, cell_weights, exact=False, probes=probes)
+
+
+def analyze_component(
+    cells,
+    constraints,
+    density,
+    exact_limit=EXACT_COMPONENT_LIMIT,
+    time_budget=SAMPLE_TIME_BUDGET,
+    seed=None,
+    deadline=None,
+):
+    """
+    Enumerate a component exactly when affordable, otherwise sample it.
+
+    Components of at most ``exact_limit`` cells are always enumerated.
+    Above that size the enumeration gets ``EXACT_NODE_LIMIT`` search nodes
+    and the component is sampled if it does not finish.
+
+    Args:
+        cells (list): Cells of the component
+        constraints (list): ``(cells, mines)`` constraints of the component
+        density (float): Expected mine density, used to guide the sampler
+        exact_limit (int): Largest component always enumerated exactly
+        time_budget (float): Sampling budget in seconds
+        seed (int): Seed of the sampler, for reproducible estimates
+        deadline (float): ``time.perf_counter()`` value at which enumeration
+            and sampling stop
+
+    Returns:
+        ComponentResult
+    """
+    node_limit = None if len(cells) <= exact_limit else EXACT_NODE_LIMIT
+    result = enumerate_component(
+        cells, constraints, node_limit=node_limit, deadline=deadline
+    )
+    if result is not None:
+        return result
+    rng = random.Random(seed) if seed is not None else None
+    return sample_component(
+        cells,
+        constraints,
+        density,
+        time_budget=time_budget,
+        rng=rng,
+        deadline=deadline,
+    )
+
+
+def _log_binomial(n, k):
+    if k < 0 or k > n:
+        return None
+    return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+
+def _normalized(dist):
+    top = max(dist.values(), default=0)
+    if top <= 0:
+        return dist
+    return {k: v / top for k, v in dist.items()}
+
+
+def _convolve(a, b):
+    out = {}
+    for i, wa in a.items():
+        for j, wb in b.items():
+            out[i + j] = out.get(i + j, 0.0) + wa * wb
+    return _normalized(out)
+
+
+class FrontierAnalysis:
+    """Mine probabilities of the frontier and of the unconstrained cells."""
+
+    def __init__(self, probabilities, interior_probability, intervals, components):
+        self.probabilities = probabilities
+        self.interior_probability = interior_probability
+        self.intervals = intervals
+        self.components = components
+
+    @property
+    def exact(self):
+        return all(result.exact for result in self.components)
+
+    @property
+    def samples(self):
+        return sum(result.samples for result in self.components)
+
+    def safest(self):
+        """Frontier cell with the lowest mine probability, and that probability."""
+        if not self.probabilities:
+            return None, 1.0
+        cell = min(self.probabilities, key=self.probabilities.get)
+        return cell, self.probabilities[cell]
+
+
+def combine(results, unconstrained, remaining_mines):
+    """
+    Merge component results with the mines left for unconstrained cells.
+
+    A global configuration with ``t`` frontier mines leaves
+    ``remaining_mines - t`` mines for the ``unconstrained`` cells, which can
+    be placed in ``C(unconstrained, remaining_mines - t)`` ways. The
+    distributions of the components are convolved with that count, using
+    prefix products and a suffix recurrence so every component is weighted
+    by all the others in linear time.
+
+    Args:
+        results (list): ComponentResult per component
+        unconstrained (int): Number of hidden unflagged cells off the frontier
+        remaining_mines (int): Mines not yet flagged
+
+    Returns:
+        FrontierAnalysis
+
+    Raises:
+        ValueError: If no configuration is consistent with the board
+    """
+    # Rescale every component so its largest weight is 1
+    scales = [1.0 / max(result.weights.values(), default=1.0) for result in results]
+    dists = [
+        {k: w * scale for k, w in result.weights.items()}
+        for result, scale in zip(results, scales)
+    ]
+    max_total = sum(max(d, default=0) for d in dists)
+    low = remaining_mines - max_total
+
+    # tail[m]: weight of placing m mines in the unconstrained cells
+    log_tail = {}
+    for m in range(max(0, low), remaining_mines + 1):
+        value = _log_binomial(unconstrained, m)
+        if value is not None:
+            log_tail[m] = value
+    if not log_tail:
+        raise ValueError("No consistent mine configuration")
+    top = max(log_tail.values())
+    tail = {m: math.exp(v - top) for m, v in log_tail.items()}
+
+    # suffix[i][m]: weight of placing m mines in components i.. and the rest
+    suffix = [None] * (len(dists) + 1)
+    suffix[len(dists)] = tail
+    for i in range(len(dists) - 1, -1, -1):
+        nxt = suffix[i + 1]
+        current = {}
+        for m in range(max(0, low), remaining_mines + 1):
+            total = 0.0
+            for k, w in dists[i].items():
+                total += w * nxt.get(m - k, 0.0)
+            if total:
+                current[m] = total
+        suffix[i] = _normalized(current)
+
+    probabilities = {}
+    intervals = {}
+    prefix = {0: 1.0}
+    for i, result in enumerate(results):
+        nxt = suffix[i + 1]
+        rest = {}
+        for k in dists[i]:
+            total = 0.0
+            for p, w in prefix.items():
+                total += w * nxt.get(remaining_mines - k - p, 0.0)
+            rest[k] = total
+        denominator = sum(dists[i][k] * rest[k] for k in dists[i])
+        if denominator <= 0:
+            raise ValueError("No consistent mine configuration")
+
+        for j, cell in enumerate(result.cells):
+            numerator = scales[i] * sum(
+                result.cell_weights[k][j] * rest[k] for k in dists[i]
+            )
+            probabilities[cell] = min(1.0, max(0.0, numerator / denominator))
+        if not result.exact:
+            intervals.update(_sample_intervals(result, rest, probabilities))
+        prefix = _convolve(prefix, dists[i])
+
+    interior_probability = None
+    if unconstrained:
+        weight = expected = 0.0
+        for t, w in prefix.items():
+            m = remaining_mines - t
+            if m in tail:
+                weight += w * tail[m]
+                expected += w * tail[m] * m
+        if weight <= 0:
+            raise ValueError("No consistent mine configuration")
+        interior_probability = expected / weight / unconstrained
+    return FrontierAnalysis(probabilities, interior_probability, intervals, results)
+
+
+def _sample_intervals(result, rest, probabilities):
+    """Normal-approximation confidence intervals of a ratio estimator."""
+    top = max(log_weight for _, log_weight, _ in result.probes)
+    weights = [
+        (math.exp(log_weight - top) * rest.get(mines, 0.0), mask)
+        for mines, log_weight, mask in result.probes
+    ]
+    total = sum(w for w, _ in weights)
+    intervals = {}
+    if total <= 0:
+        return intervals
+    for j, cell in enumerate(result.cells):
+        p = probabilities[cell]
+        bit = 1 << j
+        spread = sum((w * ((mask & bit) != 0) - p * w) ** 2 for w, mask in weights)
+        half = CONFIDENCE_Z * math.sqrt(spread) / total
+        intervals[cell] = (max(0.0, p - half), min(1.0, p + half))
+    return intervals
+
+
+class FrontierAnalyzer:
+    """Computes mine probabilities for a solver's game."""
+
+    def __init__(
+        self,
+        solver,
+        exact_limit=EXACT_COMPONENT_LIMIT,
+        time_budget=SAMPLE_TIME_BUDGET,
+        workers=None,
+        parallel_threshold=PARALLEL_COMPONENT_THRESHOLD,
+        reuse_results=False,
+    ):
+        """
+        Args:
+            solver (BaseSolver): Solver whose game and neighbour table are used
+            exact_limit (int): Components larger than this may be sampled
+            time_budget (float): Sampling budget per sampled component
+            workers (int): Worker processes for large components (1
+                disables, None uses ``default_workers()``)
+            parallel_threshold (int): Components with more cells than this
+                are sent to the workers; smaller ones are cheaper to analyse
+                inline than to pickle
+            reuse_results (bool): Keep the exact results of the last analysis
+                and reuse them for components whose constraints did not
+                change, so that after a move only the components it touched
+                are analysed again
+        """
+        self.solver = solver
+        self.game = solver.game
+        self.exact_limit = exact_limit
+        self.time_budget = time_budget
+        self.workers = default_workers() if workers is None else workers
+        self.parallel_threshold = parallel_threshold
+        self.reuse_results = reuse_results
+        self._results = {}  # Exact results of the last analysis by constraints
+        self.reused = 0  # Components answered from ``_results`` last time
+
+    def analyze(self, deadline=None, constraints=None):
+        """
+        Compute the mine probability of every frontier cell.
+
+        Args:
+            deadline (float): ``time.perf_counter()`` value by which the
+                analysis should finish; components still running then are
+                estimated from what was sampled so far
+            constraints (list): ``frontier_constraints`` of the game, if the
+                caller already built them
+
+        Returns:
+            FrontierAnalysis
+
+        Raises:
+            ValueError: If the flags make the board inconsistent
+        """
+        game = self.game
+        if constraints is None:
+            constraints = frontier_constraints(game, self.solver.neighbors)
+        components = split_components(constraints)
+
+        frontier_size = sum(len(cells) for cells, _ in components)
+        unknown = game.unknown_count()
+        remaining = game.num_mines - game.flag_count
+        density = remaining / unknown if unknown else 0.0
+
+        results = self.analyze_components(components, density, deadline)
+        # A component where sampling found no solution at all carries no
+        # information; its cells are treated like the unconstrained ones
+        # rather than failing the whole analysis
+        solved = [result for result in results if result.weights]
+        unresolved = sum(len(result.cells) for result in results if not result.weights)
+        analysis = combine(solved, unknown - frontier_size + unresolved, remaining)
+        analysis.components = results
+        return analysis
+
+    def analyze_components(self, components, density, deadline=None):
+        """
+        Analyse every component, in parallel where it pays off.
+
+        Large components go to the shared process pool when there are at
+        least two of them; the small ones are analysed inline while the
+        workers run. Seeds are drawn up front so results do not depend on
+        which process handled a component. ``deadline`` is a
+        ``time.perf_counter()`` value, a system-wide clock, so it holds in
+        the workers too. If the pool cannot start or breaks, the components
+        are analysed inline instead. With ``reuse_results``, components
+        already enumerated exactly by the previous call are not analysed
+        again.
+
+        Returns:
+            list: ComponentResult per component, in input order
+        """
+        tasks = [
+            (
+                cells,
+                cons,
+                density,
+                self.exact_limit,
+                self.time_budget,
+                random.getrandbits(32),
+                deadline,
+            )
+            for cells, cons in components
+        ]
+        results = [None] * len(tasks)
+        keys = None
+        if self.reuse_results:
+            keys = [tuple(sorted(cons)) for _, cons in components]
+            results = [self._results.get(key) for key in keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+        self.reused = len(tasks) - len(pending)
+
+        large = [i for i in pending if len(tasks[i][0]) > self.parallel_threshold]
+        executor = get_executor(self.workers) if len(large) > 1 else None
+
+        futures = {}
+        if executor is not None:
+            try:
+                futures = {
+                    i: executor.submit(analyze_component, *tasks[i]) for i in large
+                }
+            except _POOL_ERRORS:
+                shutdown_executor(executor)
+                futures = {}
+        for i in pending:
+            if i not in futures:
+                results[i] = analyze_component(*tasks[i])
+        for i, future in futures.items():
+            try:
+                results[i] = future.result()
+            except _POOL_ERRORS:
+                shutdown_executor(executor)
+                results[i] = analyze_component(*tasks[i])
+        if keys is not None:
+            self._results = {
+                key: result for key, result in zip(keys, results) if result.exact
+            }
+        return results
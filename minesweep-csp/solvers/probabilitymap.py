@@ -0,0 +1,168 @@
+import base64
+import math
+import threading
+import time
+from collections import namedtuple
+
+from solvers.basesolver import BaseSolver
+from solvers.endgame import ENDGAME_THRESHOLD, solve_endgame
+from solvers.frontier import FrontierAnalyzer
+
+# A probability p is stored as round(p * SCALE) in one byte per cell
+SCALE = 254
+# Byte of the cells that are revealed or flagged
+KNOWN = 255
+
+CacheInfo = namedtuple("CacheInfo", "hits misses")
+_stats = {"hits": 0, "misses": 0}
+
+
+def cache_info():
+    """Hits and misses of every ``ProbabilityMap``, like ``lru_cache``."""
+    return CacheInfo(_stats["hits"], _stats["misses"])
+
+
+def encode(game, probabilities, interior):
+    """
+    Quantize the mine probabilities of a board to one byte per cell.
+
+    Args:
+        game (MinesweeperBackend): Game the probabilities belong to
+        probabilities (dict): Probability of the cells with their own value
+        interior (float): Probability of the other unknown cells, or None if
+            there are none
+
+    Returns:
+        bytearray: Row-major bytes, ``KNOWN`` for revealed and flagged cells
+    """
+    fill = KNOWN if interior is None else round(interior * SCALE)
+    size = game.width * game.height
+    # One 0/1 byte per cell for each layer, OR-ed as big integers, then mapped
+    # to the output bytes in C rather than with a Python loop per cell
+    revealed = int.from_bytes(b"".join(map(bytes, game.revealed)), "big")
+    flagged = int.from_bytes(b"".join(map(bytes, game.flagged)), "big")
+    table = bytes([fill, KNOWN]) + bytes(254)
+    data = bytearray((revealed | flagged).to_bytes(size, "big").translate(table))
+    width = game.width
+    for (x, y), probability in probabilities.items():
+        data[y * width + x] = round(probability * SCALE)
+    return data
+
+
+class _AnalysisSolver(BaseSolver):
+    """Board helpers for the probability analysis; it never makes a move."""
+
+    def solve_step(self, deadline=None):
+        return False
+
+
+class ProbabilityMap:
+    """
+    Mine probability of every unknown cell of a game, cached per version.
+
+    The map is recomputed only when ``game.version`` changed since the last
+    request, or when the last analysis was cut short by its deadline and the
+    new request grants a larger budget. The frontier analyzer keeps the
+    exact result of every component between calls, so after a move only the
+    components whose constraints changed are enumerated again; the cells
+    away from the frontier share the interior probability derived from the
+    remaining mine count. Once few unknown cells remain, the exact endgame
+    count is used instead.
+    """
+
+    def __init__(self, game, workers=1):
+        """
+        Args:
+            game (MinesweeperBackend): Game to analyse
+            workers (int): Worker processes of the frontier analysis
+        """
+        self.game = game
+        self.solver = _AnalysisSolver(game)
+        self.analyzer = FrontierAnalyzer(
+            self.solver, workers=workers, reuse_results=True
+        )
+        self.version = None
+        self.result = None
+        self.budget = None  # Seconds granted to the cached result
+        self._lock = threading.Lock()
+
+    def get(self, deadline=None):
+        """
+        Probabilities of the current state, computed if needed.
+
+        Args:
+            deadline (float): ``time.perf_counter()`` value by which the
+                analysis should finish; estimates stop there. A result
+                truncated by an earlier deadline is only reused if this one
+                leaves no more time
+
+        Returns:
+            tuple: ``(result, cached)`` with ``result`` as built by
+                ``compute`` and ``cached`` telling whether it was reused
+
+        Raises:
+            ValueError: If the flags make the board inconsistent
+        """
+        with self._lock:
+            if deadline is None:
+                budget = math.inf
+            else:
+                budget = max(0.0, deadline - time.perf_counter())
+            if (
+                self.result is not None
+                and self.version == self.game.version
+                and (not self.result["truncated"] or budget <= self.budget)
+            ):
+                _stats["hits"] += 1
+                return self.result, True
+            _stats["misses"] += 1
+            version = self.game.version
+            self.result = self.compute(deadline)
+            self.version = version
+            self.budget = budget
+            return self.result, False
+
+    def compute(self, deadline=None):
+        """
+        Analyse the board and encode the probabilities.
+
+        Returns:
+            dict: ``version``, board size, ``data`` (base64 of the bytes
+                from ``encode``), ``scale`` and ``known`` to decode them, the
+                ``interior`` probability, whether the values are ``exact``,
+                the ``engine`` used, the number of components reused from
+                the previous analysis and whether the deadline ``truncated``
+                it
+        """
+        game = self.game
+        solution = None
+        if game.unknown_count() <= ENDGAME_THRESHOLD:
+            solution = solve_endgame(game, self.solver.neighbors, deadline)
+        if solution is not None:
+            probabilities = solution.probabilities
+            interior = None
+            exact = True
+            engine = "endgame"
+            reused = 0
+        else:
+            analysis = self.analyzer.analyze(deadline)
+            probabilities = analysis.probabilities
+            interior = analysis.interior_probability
+            exact = analysis.exact
+            engine = "frontier"
+            reused = self.analyzer.reused
+
+        data = encode(game, probabilities, interior)
+        return {
+            "version": game.version,
+            "width": game.width,
+            "height": game.height,
+            "scale": SCALE,
+            "known": KNOWN,
+            "data": base64.b64encode(data).decode("ascii"),
+            "interior": interior,
+            "exact": exact,
+            "engine": engine,
+            "reused_components": reused,
+            "truncated": deadline is not None and time.perf_counter() >= deadline,
+        }
@@ -0,0 +1,149 @@
+import importlib
+
+# Capabilities a solver can declare. Mine probabilities are only exact when the
+# step's tier is "enumeration" or "endgame"; otherwise they are estimates
+MINE_PROBABILITIES = "mine_probabilities"
+TIME_BUDGET = "time_budget"  # Honours the deadline given to solve_step
+BATCH_MOVES = "batch_moves"  # Can find several safe cells and mines per step
+CAPABILITIES = (MINE_PROBABILITIES, TIME_BUDGET, BATCH_MOVES)
+
+DEFAULT_SOLVER = "greedy"
+
+
+class SolverSpec:
+    """A registered solver, whose class is only imported on first use."""
+
+    def __init__(self, solver_id, target, name, description, capabilities=()):
+        """
+        Args:
+            solver_id (str): Id used by games, the API and the benchmarks
+            target (str | type): ``"module:Class"`` to import lazily, or the
+                solver class itself
+            name (str): Display name
+            description (str): One-sentence description for the API
+            capabilities (tuple): Subset of ``CAPABILITIES``
+        """
+        unknown = set(capabilities) - set(CAPABILITIES)
+        if unknown:
+            raise ValueError(f"Unknown solver capabilities: {sorted(unknown)}")
+        self.id = solver_id
+        self.target = target
+        self.name = name
+        self.description = description
+        self.capabilities = tuple(capabilities)
+        self._class = None if isinstance(target, str) else target
+
+    @property
+    def loaded(self):
+        """Whether the solver class has been imported."""
+        return self._class is not None
+
+    def load(self):
+        """Import the solver class if needed and return it."""
+        if self._class is None:
+            module, _, name = self.target.partition(":")
+            self._class = getattr(importlib.import_module(module), name)
+        return self._class
+
+    def describe(self):
+        """Metadata of the solver, without importing it."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "capabilities": list(self.capabilities),
+            "loaded": self.loaded,
+        }
+
+
+_solvers = {}  # Id -> SolverSpec, in registration order
+_aliases = {}  # Former or alternative id -> id
+
+
+def register(solver_id, target, name, description, capabilities=(), aliases=()):
+    """
+    Register a solver; this is the only step needed to add one.
+
+    Registered solvers can be used by games, are listed by ``/api/solvers``
+    and take part in benchmark tournaments.
+
+    Args:
+        solver_id (str): Id of the solver
+        target (str | type): ``"module:Class"`` or the solver class
+        name (str): Display name
+        description (str): One-sentence description
+        capabilities (tuple): Subset of ``CAPABILITIES``
+        aliases (tuple): Other ids resolving to this solver
+
+    Returns:
+        SolverSpec
+    """
+    spec = SolverSpec(solver_id, target, name, description, capabilities)
+    _solvers[solver_id] = spec
+    for alias in aliases:
+        _aliases[alias] = solver_id
+    return spec
+
+
+def get(solver_id):
+    """
+    Spec of a registered solver.
+
+    Raises:
+        ValueError: If no solver is registered under ``solver_id``
+    """
+    spec = _solvers.get(_aliases.get(solver_id, solver_id))
+    if spec is None:
+        raise ValueError(
+            f"Unknown solver type {solver_id!r}, expected one of {solver_ids()}"
+        )
+    return spec
+
+
+def create(solver_id, game):
+    """Instantiate the solver ``solver_id`` for ``game``."""
+    return get(solver_id).load()(game)
+
+
+def solver_ids():
+    """Ids of the registered solvers, in registration order."""
+    return list(_solvers)
+
+
+def specs():
+    """Specs of the registered solvers, in registration order."""
+    return list(_solvers.values())
+
+
+register(
+    "greedy",
+    "solvers.greedysolver:GreedySolver",
+    "Greedy Solver",
+    "A basic solver that makes random guesses without taking into account "
+    "cells information",
+    aliases=("basic",),
+)
+register(
+    "astar",
+    "solvers.astarsolver:AstarSolver",
+    "A* Solver",
+    "An A* based solver that uses trivial moves, an exact endgame and random "
+    "guesses when needed",
+    capabilities=(TIME_BUDGET, BATCH_MOVES),
+)
+register(
+    "astar_boost",
+    "solvers.astarboostedsolver:AstarBoostedSolver",
+    "A* Boost",
+    "An enhanced A* solver with probabilistic frontier analysis for better mine "
+    "probability estimation when no trivial moves is found",
+    capabilities=(MINE_PROBABILITIES, TIME_BUDGET, BATCH_MOVES),
+)
+register(
+    "astar_bitboard",
+    "solvers.astarbitboardsolver:AstarBitboardSolver",
+    "A* Bitboard",
+    "The A* solver with its deduction sweep computed on big-int bitboards, much "
+    "faster on large boards",
+    capabilities=(TIME_BUDGET, BATCH_MOVES),
+)
@@ -0,0 +1,56 @@
+import random
+
+import pytest
+
+from backend import MinesweeperBackend
+from chunkedboard import ChunkedMinesweeperBackend
+from solvers.astarbitboardsolver import AstarBitboardSolver
+from solvers.astarsolver import AstarSolver
+
+SIZES = [(9, 9), (16, 16), (30, 16)]
+DENSITIES = [10, 15, 20]
+
+
+def random_state(seed):
+    """
+    Game in a random mid-game state: a few random clicks, explosions
+    included, and a few random flags, some of them wrong.
+    """
+    rng = random.Random(seed)
+    width, height = rng.choice(SIZES)
+    density = rng.choice(DENSITIES)
+    game = MinesweeperBackend(width, height, width * height * density // 100, seed=seed)
+    for _ in range(rng.randrange(1, 6)):
+        x, y = rng.randrange(width), rng.randrange(height)
+        if not game.revealed[y][x]:
+            game.reveal(x, y)
+    for _ in range(rng.randrange(10)):
+        x, y = rng.randrange(width), rng.randrange(height)
+        if not game.revealed[y][x]:
+            game.toggle_flag(x, y)
+    return game
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_bitboard_matches_astar(seed):
+    game = random_state(seed)
+    astar = AstarSolver(game)
+    astar.find_trivial_moves()
+    bitboard = AstarBitboardSolver(game)
+    bitboard.find_trivial_moves()
+
+    # Order matters too: the first safe move is the one revealed
+    assert bitboard.safe_moves == astar.safe_moves
+    assert bitboard.flagged_cells == astar.flagged_cells
+
+
+def test_bitboard_falls_back_on_chunked_boards():
+    game = ChunkedMinesweeperBackend(64, 64, density=0.15, seed=1)
+    game.reveal(32, 32)
+    astar = AstarSolver(game)
+    astar.find_trivial_moves()
+    bitboard = AstarBitboardSolver(game)
+    bitboard.find_trivial_moves()
+
+    assert bitboard.safe_moves == astar.safe_moves
+    assert bitboard.flagged_cells == astar.flagged_cells
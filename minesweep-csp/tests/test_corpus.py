@@ -0,0 +1,48 @@
+import pytest
+
+from backend import MinesweeperBackend
+from corpus import BoardCorpus, board_seed, generate, pack_grid, unpack_grid
+
+GROUPS = [(9, 9, 10), (16, 16, 40), (30, 16, 99)]
+COUNT = 20
+SEED = 3
+
+
+@pytest.fixture(scope="module")
+def boards(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("corpus") / "boards")
+    generate(path, GROUPS, COUNT, seed=SEED, workers=1)
+    corpus = BoardCorpus(path)
+    yield corpus
+    corpus.close()
+
+
+@pytest.mark.parametrize("width, height, num_mines", GROUPS)
+def test_corpus_boards_match_seeded_backend(boards, width, height, num_mines):
+    assert boards.count(width, height, num_mines) == COUNT
+    for index in range(COUNT):
+        seed = boards.board_seed(width, height, num_mines, index)
+        assert seed == board_seed(SEED, width, height, num_mines, index)
+        expected = MinesweeperBackend(width, height, num_mines, seed=seed)
+        assert boards.grid(width, height, num_mines, index) == expected.grid
+
+        game = boards.board(width, height, num_mines, index, "astar")
+        assert game.grid == expected.grid
+        assert game.seed == seed
+        assert game.solver_type == "astar"
+        assert boards.find(width, height, num_mines, seed) == index
+
+
+def test_missing_group(boards):
+    assert boards.count(9, 9, 11) == 0
+    assert boards.find(9, 9, 11, 0) is None
+    with pytest.raises(KeyError):
+        boards.grid(9, 9, 11, 0)
+    with pytest.raises(IndexError):
+        boards.grid(9, 9, 10, COUNT)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_pack_grid_round_trip(seed):
+    game = MinesweeperBackend(30, 16, 99, seed=seed)
+    assert unpack_grid(pack_grid(game.grid), 30, 16) == game.grid
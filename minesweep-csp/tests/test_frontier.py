@@ -0,0 +1,117 @@
+import math
+import random
+from itertools import combinations
+
+import pytest
+
+from backend import MinesweeperBackend
+from solvers.endgame import solve_endgame, unknown_cells
+from solvers.frontier import (
+    FrontierAnalyzer,
+    combine,
+    frontier_constraints,
+    sample_component,
+    split_components,
+)
+
+# Small enough for brute force over every placement of the remaining mines
+BOARDS = [(4, 4, 3), (5, 5, 4), (6, 4, 4)]
+
+
+def small_state(seed):
+    """
+    Game on a small board after a few safe reveals and a correct flag or
+    two, so the brute-force count has a consistent board to work on.
+    """
+    rng = random.Random(seed)
+    width, height, num_mines = rng.choice(BOARDS)
+    game = MinesweeperBackend(width, height, num_mines, seed=seed)
+    cells = [(x, y) for y in range(height) for x in range(width)]
+    safe = [(x, y) for x, y in cells if game.grid[y][x] != -1]
+    mines = [(x, y) for x, y in cells if game.grid[y][x] == -1]
+    for x, y in rng.sample(safe, rng.randrange(1, 3)):
+        if not game.revealed[y][x]:
+            game.reveal(x, y)
+    for x, y in rng.sample(mines, rng.randrange(2)):
+        game.toggle_flag(x, y)
+    return game
+
+
+def brute_force(game):
+    """Completions with a mine on each unknown cell, and their number."""
+    unknown = unknown_cells(game)
+    constraints = [
+        ([unknown.index(cell) for cell in cells], mines)
+        for cells, mines in frontier_constraints(game, game.solver.neighbors)
+    ]
+    counts = [0] * len(unknown)
+    total = 0
+    for placement in combinations(
+        range(len(unknown)), game.num_mines - game.flag_count
+    ):
+        chosen = set(placement)
+        if all(len(chosen.intersection(c)) == m for c, m in constraints):
+            total += 1
+            for i in placement:
+                counts[i] += 1
+    return unknown, counts, total
+
+
+def analysis_probability(analysis, cell):
+    if cell in analysis.probabilities:
+        return analysis.probabilities[cell]
+    return analysis.interior_probability
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_enumeration_matches_brute_force(seed):
+    game = small_state(seed)
+    unknown, counts, total = brute_force(game)
+    if not unknown:
+        return
+    analysis = FrontierAnalyzer(game.solver, workers=1).analyze()
+    assert analysis.exact
+    for cell, count in zip(unknown, counts):
+        assert analysis_probability(analysis, cell) == pytest.approx(
+            count / total, abs=1e-9
+        )
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_sampling_matches_brute_force(seed):
+    game = small_state(seed)
+    unknown, counts, total = brute_force(game)
+    if not unknown:
+        return
+    constraints = frontier_constraints(game, game.solver.neighbors)
+    components = split_components(constraints)
+    remaining = game.num_mines - game.flag_count
+    rng = random.Random(seed)
+    results = [
+        sample_component(
+            cells,
+            cons,
+            remaining / len(unknown),
+            time_budget=math.inf,
+            max_samples=20_000,
+            rng=rng,
+        )
+        for cells, cons in components
+    ]
+    frontier_size = sum(len(cells) for cells, _ in components)
+    analysis = combine(results, len(unknown) - frontier_size, remaining)
+    for cell, count in zip(unknown, counts):
+        assert analysis_probability(analysis, cell) == pytest.approx(
+            count / total, abs=0.05
+        )
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_endgame_matches_brute_force(seed):
+    game = small_state(seed)
+    unknown, counts, total = brute_force(game)
+    if not unknown:
+        return
+    solution = solve_endgame(game, game.solver.neighbors)
+    assert solution.total == total
+    assert dict(zip(solution.cells, solution.mine_counts)) == dict(zip(unknown, counts))
@@ -0,0 +1,50 @@
+import contextlib
+import io
+
+import pytest
+
+from backend import MinesweeperBackend
+from movelog import MoveLog
+from replay import record, replay, seed_step
+
+SOLVERS = ["greedy", "astar", "astar_boost", "astar_bitboard"]
+
+
+def play(width, height, num_mines, solver_type, seed):
+    """Play a game the way ``record`` does and return the finished game."""
+    game = MinesweeperBackend(width, height, num_mines, solver_type, seed=seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for step in range(width * height):
+            seed_step(seed, step)
+            if game.game_over or game.solve_next_move() is None:
+                break
+            game.apply_solver_move()
+    return game
+
+
+def actions(log):
+    return [(move.action, move.x, move.y, move.solver) for move in log]
+
+
+@pytest.mark.parametrize("solver_type", SOLVERS)
+@pytest.mark.parametrize("seed", range(5))
+def test_replay_matches_recorded_game(solver_type, seed):
+    game = play(16, 16, 40, solver_type, seed)
+    log = MoveLog.from_bytes(game.move_log.to_bytes())
+
+    result = replay(log, verify=True)
+
+    assert result["mismatches"] == []
+    assert result["divergences"] == []
+    assert result["actions"] == len(game.move_log)
+    assert result["won"] == game.won
+    assert result["game_over"] == game.game_over
+    assert result["explosions"] == game.nb_explosions
+    assert result["unknown"] == game.unknown_count()
+
+
+@pytest.mark.parametrize("solver_type", SOLVERS)
+def test_record_matches_played_game(solver_type):
+    game = play(16, 16, 40, solver_type, 7)
+    log = record(16, 16, 40, solver_type, 7, max_moves=16 * 16)
+    assert actions(log) == actions(game.move_log)
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from backend import MinesweeperBackend
+from chunkedboard import ChunkedMinesweeperBackend
+
+
+def state(game):
+    """Everything a restore has to bring back, in comparable form."""
+    board = game.get_game_state()
+    board.pop("tiles", None)  # Tiles loaded meanwhile may stay cached
+    return (
+        board,
+        sorted(game.revealed_cells()),
+        game.flag_count,
+        game.unknown_count(),
+    )
+
+
+def random_moves(game, rng, count):
+    """Random reveals (explosions included) and flag toggles."""
+    for _ in range(count):
+        x, y = rng.randrange(game.width), rng.randrange(game.height)
+        if rng.random() < 0.7:
+            game.reveal(x, y)
+        else:
+            game.toggle_flag(x, y)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_restore_matches_original_state(seed):
+    rng = random.Random(seed)
+    game = MinesweeperBackend(16, 16, 40, seed=seed)
+    random_moves(game, rng, rng.randrange(5))
+    before = state(game)
+
+    token = game.snapshot()
+    random_moves(game, rng, rng.randrange(1, 30))
+    game.restore(token)
+
+    assert state(game) == before
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_nested_restore_matches_each_state(seed):
+    rng = random.Random(seed)
+    game = MinesweeperBackend(16, 16, 40, seed=seed)
+    outer_state = state(game)
+    outer = game.snapshot()
+    random_moves(game, rng, 10)
+    inner_state = state(game)
+    with game.hypothetical():
+        random_moves(game, rng, 10)
+    assert state(game) == inner_state
+    game.restore(outer)
+    assert state(game) == outer_state
+
+
+def test_restore_bumps_version():
+    game = MinesweeperBackend(9, 9, 10, seed=1)
+    token = game.snapshot()
+    game.reveal(4, 4)
+    version = game.version
+    game.restore(token)
+    assert game.version > version
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_chunked_restore_matches_original_state(seed):
+    rng = random.Random(seed)
+    game = ChunkedMinesweeperBackend(64, 64, 0.15, seed=seed, tile_size=16)
+    game.reveal(32, 32)
+    before = state(game)
+
+    with game.hypothetical():
+        random_moves(game, rng, 30)
+
+    assert state(game) == before